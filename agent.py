@@ -1,51 +1,291 @@
 """Main agent orchestrator for AI news scraping and summarization."""
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from scraper import NewsScraper
 from categorizer import ArticleCategorizer
+from dedup import ArticleDeduplicator
+from ranking import TopK, select_top
+from seen_store import get_seen_store
 from summarizer import ArticleSummarizer
 from startup_fetcher import StartupFetcher
+from config import (
+    SCRAPER_ENGINE, TOP_ARTICLES_PER_CATEGORY, RUN_DEADLINE, INCREMENTAL_SCRAPING, TIERED_CATEGORIZATION
+)
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
+import time
 
 
 class AINewsAgent:
     """Main agent that orchestrates scraping, categorization, and summarization."""
     
-    def __init__(self):
-        self.scraper = NewsScraper()
+    def __init__(self, engine: str = SCRAPER_ENGINE, incremental: bool = INCREMENTAL_SCRAPING,
+                 remember_seen: bool = True, tiered_categorization: bool = TIERED_CATEGORIZATION):
+        if engine == "async":
+            from async_scraper import AsyncNewsScraper
+            self.scraper = AsyncNewsScraper(incremental=incremental)
+        elif engine == "threads":
+            self.scraper = NewsScraper(incremental=incremental)
+        else:
+            raise ValueError(f"Unknown scraper engine: {engine} (expected 'threads' or 'async')")
+        self.deduplicator = ArticleDeduplicator()
         self.categorizer = ArticleCategorizer()
+        # Categorize on title/summary; fetch full content only for ambiguous results
+        self.tiered_categorization = tiered_categorization
+        # Categories and AI summaries of articles processed in earlier runs
+        self.seen_store = get_seen_store() if remember_seen else None
         self.summarizer = ArticleSummarizer()
         self.startup_fetcher = StartupFetcher()
+        self.missing_sources = []
+    
+    def _summarize_article(self, article: Dict, category: str, fetch_full_content: bool) -> Optional[str]:
+        """Fetch an article's full content if requested, then summarize it."""
+        if fetch_full_content:
+            self.scraper.fetch_contents([article])
+        return self.summarizer.generate_summary(article, category)
+    
+    def _categorize(self, articles: List[Dict], fetch_full_content: bool = False) -> tuple:
+        """Categorize articles; with fetch_full_content and tiered categorization, ambiguous
+        results are then refined with the article's full content."""
+        categorized, uncategorized = self._categorize_first_tier(articles)
+        if fetch_full_content and self.tiered_categorization:
+            self._refine_ambiguous(categorized, uncategorized)
+        return categorized, uncategorized
+    
+    def _categorize_first_tier(self, articles: List[Dict]) -> tuple:
+        """Categorize articles on title and summary; ones seen in earlier runs reuse their stored
+        category and summary."""
+        if not self.seen_store:
+            return self.categorizer.categorize_articles(articles)
+        
+        novel = self.seen_store.apply_known(articles)
+        categorized, uncategorized = self.categorizer.categorize_articles(novel)
+        self.seen_store.record_categories(novel)
+        
+        novel_ids = {id(article) for article in novel}
+        known = [article for article in articles if id(article) not in novel_ids]
+        for article in known:
+            category = article.get("category")
+            if category in categorized:
+                categorized[category].append(article)
+            else:
+                uncategorized.append(article)
+        if known:
+            print(f"  ↺ Reused stored results for {len(known)} articles seen in earlier runs")
+        return categorized, uncategorized
+    
+    def _needs_refinement(self, article: Dict) -> bool:
+        """Whether an article's category rests on weak title/summary evidence (e.g. a single keyword match)."""
+        return (article.get("category_tier", 1) == 1
+                and self.categorizer.is_ambiguous(article.get("category_score", 0.0)))
     
-    def run(self, days: int = 7, fetch_full_content: bool = False, generate_summaries: bool = True) -> Dict[str, List[Dict]]:
-        """Run the complete pipeline."""
+    def _refine_ambiguous(self, categorized: Dict[str, List[Dict]], uncategorized: List[Dict]):
+        """Second tier: fetch full content for ambiguous articles, including stored ones, and
+        categorize them again on the full text."""
+        ambiguous = [
+            article for articles in categorized.values() for article in articles
+            if self._needs_refinement(article)
+        ]
+        if not ambiguous:
+            return
+        
+        self.scraper.fetch_contents(ambiguous)
+        refined = [article for article in ambiguous if article.get("full_content")]
+        if not refined:
+            return
+        
+        refined_ids = {id(article) for article in refined}
+        previous = {id(article): article.get("category") for article in refined}
+        for category, articles in categorized.items():
+            categorized[category] = [article for article in articles if id(article) not in refined_ids]
+        for article in refined:
+            article.pop("category", None)
+            article.pop("category_score", None)
+            article["category_tier"] = 2
+        
+        recategorized, still_uncategorized = self.categorizer.categorize_articles(refined)
+        for category, articles in recategorized.items():
+            for article in articles:
+                # Ranked on the same title/summary evidence as every other article; a full-text
+                # score would let refined articles outrank confident first-tier ones
+                headline = {"title": article.get("title", ""), "summary": article.get("summary", "")}
+                article["category_score"] = self.categorizer.category_confidence(headline, category)
+            categorized[category].extend(articles)
+        uncategorized.extend(still_uncategorized)
+        changed = [article for article in refined if article.get("category") != previous[id(article)]]
+        for article in changed:
+            # A stored summary was written for the old category
+            article.pop("ai_summary", None)
+        if self.seen_store:
+            self.seen_store.record_categories(refined)
+        print(f"  ↻ Re-categorized {len(refined)} ambiguous articles with full content ({len(changed)} changed)")
+    
+    def _rank_categories(self, categorized: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """Top TOP_ARTICLES_PER_CATEGORY articles of each category by confidence, recency and source quality."""
+        now = time.time()
+        return {
+            category: select_top(articles, TOP_ARTICLES_PER_CATEGORY, now=now)
+            for category, articles in categorized.items()
+        }
+    
+    def _fetch_selected_contents(self, top_by_category: Dict[str, List[Dict]]):
+        """Lazily fetch full content only for articles selected for summarization."""
+        selected = []
+        for category, articles in top_by_category.items():
+            if category == "Cool Startups to watch":
+                continue  # Startup items are summarized from RSS summaries only
+            selected.extend(article for article in articles if not article.get("ai_summary"))
+        
+        if selected:
+            print(f"Step 3b: Fetching full content for {len(selected)} selected articles...")
+            fetched = self.scraper.fetch_contents(selected)
+            print(f"  ✓ Fetched content for {fetched}/{len(selected)} articles")
+            print()
+    
+    def _run_streaming_stages(self, days: int, fetch_full_content: bool, generate_summaries: bool,
+                              deadline: Optional[float] = None) -> tuple:
+        """Filter, categorize and start summarizing each source's articles as soon as it completes."""
+        categorized = {
+            "GPU and AI Infra": [],
+            "AI Applications": [],
+            "AI Builder tools": [],
+            "Cool Startups to watch": []
+        }
+        uncategorized = []
+        total_articles = 0
+        recent_count = 0
+        start_time = time.time()
+        first_summary_logged = False
+        
+        # Early summaries run while slow feeds are still downloading
+        summarize_early = generate_summaries and self.summarizer.client is not None
+        summary_executor = ThreadPoolExecutor(max_workers=5)
+        summary_futures = {}
+        # Streaming keeps the first copy of a story: later ones may arrive after it is being summarized
+        self.deduplicator.reset()
+        duplicate_count = 0
+        # Best articles so far per category; early summaries go to those that enter the running top-k
+        running_top = {category: TopK(TOP_ARTICLES_PER_CATEGORY) for category in categorized}
+        refine = fetch_full_content and self.tiered_categorization
+        
+        try:
+            # Full content is fetched lazily, only for articles picked for summarization
+            for source_name, articles in self.scraper.iter_scrape_sources(deadline=deadline):
+                total_articles += len(articles)
+                recent_articles = self.scraper.filter_recent_articles(articles, days=days)
+                recent_count += len(recent_articles)
+                unique_articles = []
+                for article in recent_articles:
+                    original = self.deduplicator.add(article)
+                    if original is None:
+                        unique_articles.append(article)
+                    else:
+                        original.setdefault("duplicate_sources", []).append(source_name)
+                        duplicate_count += 1
+                recent_articles = unique_articles
+                batch_categorized, batch_uncategorized = self._categorize_first_tier(recent_articles)
+                uncategorized.extend(batch_uncategorized)
+                
+                for category, category_articles in batch_categorized.items():
+                    for article in category_articles:
+                        categorized[category].append(article)
+                        # Same ranking as the final selection, applied to what has arrived so far;
+                        # an article pushed out later by better ones keeps its (unused) summary.
+                        # Ambiguous articles wait for refinement, which may change their category
+                        if (summarize_early and category != "Cool Startups to watch"
+                                and not (refine and self._needs_refinement(article))
+                                and running_top[category].push(article)
+                                and not article.get("ai_summary")):
+                            future = summary_executor.submit(
+                                self._summarize_article, article, category, fetch_full_content
+                            )
+                            summary_futures[future] = article
+                
+                if not first_summary_logged and any(f.done() for f in summary_futures):
+                    print(f"  ⏱ First summary ready after {time.time() - start_time:.1f}s")
+                    first_summary_logged = True
+            
+            print(f"Found {total_articles} total articles, {recent_count} from the last {days} days "
+                  f"({duplicate_count} cross-source duplicates dropped)")
+            
+            # Refined once all sources are in, so content fetches never hold up the scrape loop
+            if refine:
+                self._refine_ambiguous(categorized, uncategorized)
+            
+            # Collect early summaries; generate_summaries skips articles that already have one
+            for future, article in summary_futures.items():
+                try:
+                    summary = future.result(timeout=30)
+                    if summary:
+                        article["ai_summary"] = summary
+                except Exception as e:
+                    print(f"  ✗ Early summary failed: {article.get('title', '')[:50]} - {str(e)[:50]}")
+        finally:
+            summary_executor.shutdown(wait=False, cancel_futures=True)
+        
+        return categorized, uncategorized
+    
+    def run(self, days: int = 7, fetch_full_content: bool = False, generate_summaries: bool = True,
+            stream: bool = False, deadline: Optional[float] = RUN_DEADLINE) -> Dict[str, List[Dict]]:
+        """Run the complete pipeline.
+        
+        deadline bounds the scraping stage in seconds; sources that have not finished by then
+        are skipped and listed in self.missing_sources.
+        """
         print("=" * 60)
         print("AI News Agent - Scraping Latest Developments")
         print("=" * 60)
         print()
         
-        # Step 1: Scrape articles
-        print("Step 1: Scraping news sources...")
-        articles = self.scraper.scrape_all_sources(fetch_full_content=fetch_full_content)
-        print(f"Found {len(articles)} total articles")
-        print()
+        if stream:
+            # Steps 1-3 overlapped per source, with summaries starting on early arrivals
+            print("Steps 1-3: Streaming scrape, filter and categorize...")
+            categorized, uncategorized = self._run_streaming_stages(
+                days, fetch_full_content, generate_summaries, deadline=deadline
+            )
+        else:
+            # Step 1: Scrape articles (full content is fetched lazily after selection)
+            print("Step 1: Scraping news sources...")
+            articles = self.scraper.scrape_all_sources(deadline=deadline)
+            print(f"Found {len(articles)} total articles")
+            print()
+            
+            # Step 2: Filter recent articles
+            print("Step 2: Filtering recent articles...")
+            recent_articles = self.scraper.filter_recent_articles(articles, days=days)
+            print(f"Found {len(recent_articles)} articles from the last {days} days")
+            print()
+            
+            # Step 2b: Collapse copies of the same story so each is categorized and summarized once
+            print("Step 2b: Removing cross-source duplicates...")
+            unique_articles = self.deduplicator.deduplicate(recent_articles)
+            print(f"Kept {len(unique_articles)} unique stories ({len(recent_articles) - len(unique_articles)} duplicates)")
+            print()
+            
+            # Step 3: Categorize articles
+            print("Step 3: Categorizing articles...")
+            categorized, uncategorized = self._categorize(unique_articles, fetch_full_content)
         
-        # Step 2: Filter recent articles
-        print("Step 2: Filtering recent articles...")
-        recent_articles = self.scraper.filter_recent_articles(articles, days=days)
-        print(f"Found {len(recent_articles)} articles from the last {days} days")
-        print()
+        # Feed per-source useful yield back into source scheduling
+        self.scraper.record_yield(categorized)
         
-        # Step 3: Categorize articles
-        print("Step 3: Categorizing articles...")
-        categorized, uncategorized = self.categorizer.categorize_articles(recent_articles)
+        self.missing_sources = list(self.scraper.last_missing_sources)
+        if self.missing_sources:
+            print(f"  ⚠ {len(self.missing_sources)} sources missed the {deadline}s deadline")
         
         for category, articles in categorized.items():
             print(f"  {category}: {len(articles)} articles")
         print(f"  Uncategorized: {len(uncategorized)} articles")
         print()
         
+        # Rank before summarization so the LLM budget goes to the best articles, not the first to arrive
+        top_by_category = self._rank_categories(categorized)
+        
+        # Full content only feeds per-article LLM summaries
+        if fetch_full_content and generate_summaries and self.summarizer.client:
+            self._fetch_selected_contents(top_by_category)
+        
         # Step 4: Generate summaries (optional)
         # Ensure all categories are present
         results = {
@@ -60,9 +300,8 @@ class AINewsAgent:
         print(f"\nStep 4a: Fetching cool startups for '{startups_category}'...")
         startup_items, startup_summary = self.startup_fetcher.fetch_startups()
         
-        # Merge startups with any articles already categorized as startups
-        if startups_category in categorized:
-            startup_items = startup_items + categorized[startups_category]
+        # Articles categorized as startups, best-ranked first, are merged with the fetched startups
+        ranked_startups = top_by_category.get(startups_category, [])
         
         if generate_summaries:
             print("Step 4: Generating summaries...")
@@ -72,8 +311,8 @@ class AINewsAgent:
                     continue
                     
                 if articles:
-                    # Limit to top 10 most recent articles per category
-                    top_articles = articles[:10]
+                    # Best-ranked articles per category
+                    top_articles = top_by_category[category]
                     print(f"\nProcessing {category} (top {len(top_articles)} of {len(articles)} articles)...")
                     
                     # Generate category-level summary first
@@ -107,10 +346,11 @@ class AINewsAgent:
                             print(f"  ℹ No AI summaries generated (will show RSS summaries)")
                         
                         # Add category summary to all articles
-                        for article in summarized:
+                        for article in top_articles:
                             article["category_summary"] = category_summary
                         
-                        results[category] = summarized
+                        # Summaries are set on the articles in place; keep them in rank order
+                        results[category] = top_articles
                             
                     except Exception as e:
                         print(f"  ⚠ Summarization error: {e}")
@@ -127,10 +367,8 @@ class AINewsAgent:
             
             # Use specialized startup intelligence for "Cool Startups to watch"
             if startups_category == "Cool Startups to watch" and hasattr(self.summarizer, 'generate_startup_intelligence'):
-                # Get articles categorized as startups
-                startup_articles = categorized.get(startups_category, [])
-                # Merge with any fetched startup items
-                all_startup_content = startup_articles + startup_items
+                # Merge the best-ranked startup articles with the fetched startup items
+                all_startup_content = ranked_startups + startup_items
                 
                 if all_startup_content:
                     print(f"  Running 5-signal startup intelligence on {len(all_startup_content)} items...")
@@ -164,7 +402,7 @@ class AINewsAgent:
                     results[startups_category] = []
             else:
                 # Fallback to old method - limit to 10
-                all_items = (categorized.get(startups_category, []) + startup_items)[:10]
+                all_items = (ranked_startups + startup_items)[:10]
                 for startup in all_items:
                     startup["category_summary"] = startup_summary
                 results[startups_category] = all_items
@@ -175,11 +413,16 @@ class AINewsAgent:
             for category in results.keys():
                 if category == startups_category:
                     # Limit Cool Startups to 10 even in fast mode
-                    all_startup_items = startup_items + categorized.get(startups_category, [])
+                    all_startup_items = startup_items + ranked_startups
                     results[category] = all_startup_items[:10]
                 else:
-                    # Limit to top 10 for other categories too
-                    results[category] = categorized.get(category, [])[:10]
+                    # Best-ranked articles for other categories
+                    results[category] = top_by_category.get(category, [])
+        
+        # Only a completed run moves the per-source watermarks forward
+        self.scraper.commit_watermarks()
+        if self.seen_store:
+            self.seen_store.record_summaries([article for articles in results.values() for article in articles])
         
         print()
         print("=" * 60)
@@ -35,7 +35,7 @@ import csv
 SENDGRID_AVAILABLE = False
 
 try:
-    from config import MAIL_SERVER, MAIL_PORT, MAIL_USE_TLS, MAIL_USERNAME, MAIL_PASSWORD, MAIL_FROM
+    from config import MAIL_SERVER, MAIL_PORT, MAIL_USE_TLS, MAIL_USERNAME, MAIL_PASSWORD, MAIL_FROM, RUN_DEADLINE
     print("✓ Config imported successfully")
     
     # Try to import SendGrid
@@ -2349,6 +2349,12 @@ def run_agent():
         data = request.json
         days = data.get('days', 7)
         fetch_content = data.get('fetchContent', False)
+        stream = data.get('stream', False)
+        # Seconds, like RUN_DEADLINE; the scraper treats 0 or less as no deadline
+        try:
+            deadline = float(data.get('deadline', RUN_DEADLINE) or 0)
+        except (TypeError, ValueError):
+            return jsonify({"error": "deadline must be a number of seconds"}), 400
 
         # Always use AI summaries - no fast mode
         fetch_full_content = fetch_content
@@ -2359,7 +2365,9 @@ def run_agent():
         results = agent.run(
             days=days,
             fetch_full_content=fetch_full_content,
-            generate_summaries=generate_summaries
+            generate_summaries=generate_summaries,
+            stream=stream,
+            deadline=deadline
         )
         
         # Ensure all 4 categories are present
@@ -2373,7 +2381,8 @@ def run_agent():
         # Prepare response
         response_data = {
             "generated_at": datetime.now().isoformat(),
-            "categories": {}
+            "categories": {},
+            "missing_sources": agent.missing_sources
         }
         
         for category in all_categories.keys():
@@ -3005,6 +3014,16 @@ def subscribers_count():
         print(f"Error in /api/subscribers-count: {e}")
         return jsonify({"error": "Server error"}), 500
 
+@app.route('/api/source-stats')
+def source_stats():
+    """Get per-source latency, error rate, yield and circuit breaker state."""
+    try:
+        from source_health import SourceHealth
+        return jsonify({"sources": SourceHealth().stats()}), 200
+    except Exception as e:
+        print(f"Error in /api/source-stats: {e}")
+        return jsonify({"error": "Server error"}), 500
+
 if __name__ == '__main__':
     # Use Railway's PORT environment variable, fallback to 5001 for local development
     PORT = int(os.environ.get('PORT', 5001))
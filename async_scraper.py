@@ -0,0 +1,325 @@
+"""Asyncio scraping engine: one event loop for network I/O, a small executor for parsing."""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import (
+    NEWS_SOURCES, USER_AGENT, MAX_ARTICLES_PER_SOURCE, CONNECT_TIMEOUT, READ_TIMEOUT,
+    TOTAL_FETCH_TIMEOUT, ASYNC_MAX_CONCURRENCY, ASYNC_LIMIT_PER_HOST, PARSE_WORKERS, CONTENT_MAX_BYTES
+)
+from content_extractor import LXML_AVAILABLE, StreamingTextExtractor
+from fetcher import FetchResult, FetchTimeout, host_limit
+from scraper import NewsScraper, run_deadline
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Per-run state, set by the coroutine that starts a run and inherited by its tasks:
+# asyncio semaphores bind to the loop that first uses them, and each run (a scrape,
+# or fetch_contents from an agent worker thread) gets its own loop
+_host_slots: ContextVar[Dict[str, "asyncio.Semaphore"]] = ContextVar("host_slots")
+_blocking_executor: ContextVar[Optional[ThreadPoolExecutor]] = ContextVar("blocking_executor", default=None)
+
+
+class AsyncNewsScraper(NewsScraper):
+    """NewsScraper that fetches every source concurrently on a single asyncio event loop."""
+
+    def __init__(self, max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+                 limit_per_host: int = ASYNC_LIMIT_PER_HOST,
+                 parse_workers: int = PARSE_WORKERS, **kwargs):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("The async scraping engine requires aiohttp (pip install aiohttp)")
+        super().__init__(**kwargs)
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host
+        self.parse_workers = parse_workers
+
+    def _session(self):
+        """A client session capped by the connector's total and per-host limits."""
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.limit_per_host,
+                                         ttl_dns_cache=300)
+        return aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT})
+
+    async def _fetch(self, session, url: str, headers: Optional[Dict[str, str]] = None,
+                     max_bytes: Optional[int] = None,
+                     on_chunk: Optional[Callable[[bytes], bool]] = None,
+                     total_timeout: Optional[float] = None) -> FetchResult:
+        """Download a URL with aiohttp, applying the same deadlines and byte ceiling as the threaded fetcher."""
+        total_timeout = total_timeout or TOTAL_FETCH_TIMEOUT
+        start_time = time.monotonic()
+        host, limit = host_limit(url)
+        slots = _host_slots.get(None)
+        if slots is None:
+            slots = {}
+            _host_slots.set(slots)
+        slot = slots.get(host)
+        if slot is None:
+            slot = slots[host] = asyncio.Semaphore(limit)
+
+        # Waiting for a free slot counts against the same deadline, as in HTTPFetcher
+        try:
+            await asyncio.wait_for(slot.acquire(), total_timeout)
+        except asyncio.TimeoutError:
+            raise FetchTimeout(f"No free connection to {host} within {total_timeout}s: {url}")
+        try:
+            remaining = max(total_timeout - (time.monotonic() - start_time), 0.001)
+            return await self._download(session, url, headers, start_time, remaining, max_bytes, on_chunk)
+        finally:
+            slot.release()
+
+    async def _download(self, session, url: str, headers: Optional[Dict[str, str]], start_time: float,
+                        total_timeout: float, max_bytes: Optional[int],
+                        on_chunk: Optional[Callable[[bytes], bool]]) -> FetchResult:
+        """Stream one response body (host slot held by the caller)."""
+        timeout = aiohttp.ClientTimeout(total=total_timeout, connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+        request_url = self.fetcher.url_for(url)
+        async with session.get(request_url, headers=headers, timeout=timeout) as response:
+            chunks = []
+            received = 0
+            truncated = False
+            async for chunk in response.content.iter_chunked(16384):
+                if max_bytes is not None and received + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - received]
+                    truncated = True
+                chunks.append(chunk)
+                received += len(chunk)
+                if on_chunk is not None and on_chunk(chunk):
+                    truncated = True
+                if truncated:
+                    break
+
+            return FetchResult(
+                url=str(response.url) if request_url == url else url,
+                status_code=response.status,
+                headers={key.lower(): value for key, value in response.headers.items()},
+                content=b"".join(chunks),
+                elapsed=time.monotonic() - start_time,
+                truncated=truncated
+            )
+
+    async def _run_blocking(self, func, *args):
+        """Run CPU-bound parsing or a SQLite store call off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_blocking_executor.get(), func, *args)
+
+    async def fetch_rss_feed_async(self, session, url: str, max_items: int = MAX_ARTICLES_PER_SOURCE) -> List[Dict]:
+        """Async counterpart of fetch_rss_feed."""
+        try:
+            return await self._download_feed_async(session, url, max_items)
+        except Exception as e:
+            print(f"  ⚠️  Error fetching RSS feed {url}: {str(e)[:100]}")
+            return []
+
+    async def _download_feed_async(self, session, url: str, max_items: int,
+                                   total_timeout: Optional[float] = None) -> List[Dict]:
+        """Async counterpart of _download_feed; errors propagate to the caller."""
+        cached = await self._run_blocking(self._get_cached_feed, url, max_items)
+        headers = self.feed_cache.conditional_headers(cached) if cached else None
+        result = await self._fetch(session, url, headers=headers, total_timeout=total_timeout)
+        return await self._run_blocking(self._handle_feed_result, url, result, max_items, cached)
+
+    async def fetch_article_content_async(self, session, url: str) -> Optional[str]:
+        """Async counterpart of fetch_article_content."""
+        if self.content_cache:
+            cached = await self._run_blocking(self.content_cache.get, url)
+            if cached:
+                return cached
+
+        try:
+            extractor = StreamingTextExtractor() if LXML_AVAILABLE else None
+            result = await self._fetch(
+                session, url,
+                max_bytes=CONTENT_MAX_BYTES,
+                on_chunk=extractor.feed if extractor else None
+            )
+            result.raise_for_status()
+
+            # The pull parser was fed on this thread; lxml trees must not move to another one
+            content = extractor.extract() if extractor else None
+            if not content:
+                content = await self._run_blocking(self.extract_article_text, result.content)
+
+            if content and self.content_cache:
+                await self._run_blocking(self.content_cache.put, url, content)
+            return content
+        except Exception as e:
+            print(f"Error fetching article content from {url}: {e}")
+            return None
+
+    async def _scrape_single_source_async(self, session, source_name: str, source_config: Dict,
+                                          fetch_full_content: bool = False) -> tuple:
+        """Scrape a single news source; article pages are fetched concurrently."""
+        if self.health and await self._run_blocking(self.health.is_circuit_open, source_name):
+            print(f"⏸ {source_name}: circuit open after repeated failures, skipping")
+            return source_name, None
+
+        articles = []
+        start_time = time.monotonic()
+        try:
+            if source_config["type"] == "rss":
+                not_due = await self._run_blocking(
+                    self._articles_if_not_due, source_config["url"], MAX_ARTICLES_PER_SOURCE
+                )
+                if not_due is not None:
+                    print(f"💤 {source_name}: not due for refresh yet, serving {len(not_due)} cached articles")
+                    return source_name, await self._run_blocking(self._tag_source, source_name, not_due)
+
+                timeout = await self._run_blocking(self.health.timeout_for, source_name) if self.health else None
+                articles = await self._download_feed_async(
+                    session, source_config["url"], MAX_ARTICLES_PER_SOURCE, total_timeout=timeout
+                )
+                if self.health:
+                    await self._run_blocking(
+                        self.health.record, source_name, time.monotonic() - start_time, True, len(articles)
+                    )
+                articles = await self._run_blocking(self._tag_source, source_name, articles)
+
+                if fetch_full_content:
+                    linked = [article for article in articles if article.get("link")]
+                    contents = await asyncio.gather(
+                        *(self.fetch_article_content_async(session, article["link"]) for article in linked)
+                    )
+                    for article, full_content in zip(linked, contents):
+                        if full_content:
+                            article["full_content"] = full_content
+        except Exception as e:
+            print(f"✗ {source_name}: Error - {str(e)[:100]}")
+            if self.health:
+                await self._run_blocking(self.health.record, source_name, time.monotonic() - start_time, False)
+            return source_name, None
+
+        return source_name, articles
+
+    async def aiter_scrape_sources(self, fetch_full_content: bool = False,
+                                   deadline: Optional[float] = None) -> AsyncIterator[Tuple[str, List[Dict]]]:
+        """Async iterator yielding (source_name, articles) as each source completes.
+
+        With a deadline (seconds from the call), unfinished sources are cancelled when it
+        expires and listed in self.last_missing_sources. A deadline of 0 or less means none.
+        """
+        deadline = run_deadline(deadline)
+        self.last_missing_sources = []
+        self.last_completed_sources = set()
+        self._pending_watermarks = {}
+        sources = self._plan_sources()
+        total_sources = len(sources)
+
+        _host_slots.set({})
+        async with self._session() as session:
+            # Created in priority order so the best sources claim connector slots first
+            tasks = [
+                asyncio.create_task(self._scrape_single_source_async(session, name, config, fetch_full_content))
+                for name, config in sources
+            ]
+            pending_sources = {name for name, _ in sources}
+
+            try:
+                completed = 0
+                for task in asyncio.as_completed(tasks, timeout=deadline):
+                    source_name, articles = await task
+                    pending_sources.discard(source_name)
+                    completed += 1
+                    if articles is None:
+                        articles = []
+                    else:
+                        await self._run_blocking(self._mark_completed, source_name, articles)
+                    print(f"[{completed}/{total_sources}] ✓ {source_name}: {len(articles)} articles")
+                    yield source_name, articles
+            except asyncio.TimeoutError:
+                self.last_missing_sources = sorted(pending_sources)
+                print(f"⏰ Deadline of {deadline}s reached - continuing without {len(pending_sources)} sources: "
+                      f"{', '.join(self.last_missing_sources)}")
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    def iter_scrape_sources(self, fetch_full_content: bool = False, max_workers: int = None,
+                            deadline: Optional[float] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """Synchronous generator over aiter_scrape_sources; the event loop runs in a background thread."""
+        results = queue.Queue()
+        stop = threading.Event()
+        done = object()
+
+        async def pump():
+            _blocking_executor.set(executor)
+            async for item in self.aiter_scrape_sources(fetch_full_content, deadline=deadline):
+                if stop.is_set():
+                    break
+                results.put(item)
+
+        executor = ThreadPoolExecutor(max_workers=self.parse_workers)
+
+        def run_loop():
+            try:
+                asyncio.run(pump())
+            except Exception as e:
+                print(f"✗ Async scraping engine error: {str(e)[:100]}")
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+                results.put(done)
+
+        loop_thread = threading.Thread(target=run_loop, name="async-scraper", daemon=True)
+        loop_thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            stop.set()
+
+    def fetch_contents(self, articles: List[Dict], max_workers: int = None) -> int:
+        """Fetch full content for the given articles in place on an event loop of their own.
+
+        Every page is in flight at once, bounded by the connector and per-host limits
+        like a scrape (max_workers is ignored). Returns how many articles were fetched.
+        """
+        pending = [article for article in articles if article.get("link") and not article.get("full_content")]
+        if not pending:
+            return 0
+
+        async def fetch_all():
+            _host_slots.set({})
+            _blocking_executor.set(executor)
+            async with self._session() as session:
+                return await asyncio.gather(
+                    *(self.fetch_article_content_async(session, article["link"]) for article in pending)
+                )
+
+        executor = ThreadPoolExecutor(max_workers=self.parse_workers)
+        try:
+            contents = asyncio.run(fetch_all())
+        finally:
+            executor.shutdown(wait=False)
+
+        fetched = 0
+        for article, full_content in zip(pending, contents):
+            if full_content:
+                article["full_content"] = full_content
+                fetched += 1
+        return fetched
+
+    def scrape_all_sources(self, fetch_full_content: bool = False, max_workers: int = None,
+                           deadline: Optional[float] = None) -> List[Dict]:
+        """Scrape all configured news sources on one event loop (max_workers is ignored)."""
+        all_articles = []
+        total_sources = len(NEWS_SOURCES)
+        print(f"\n🚀 Scraping {total_sources} sources asynchronously (max {self.max_concurrency} in-flight requests)...\n")
+        start_time = time.time()
+
+        for _, articles in self.iter_scrape_sources(fetch_full_content=fetch_full_content, deadline=deadline):
+            all_articles.extend(articles)
+
+        elapsed_time = time.time() - start_time
+        print(f"\n✅ Scraping complete! {len(all_articles)} total articles in {elapsed_time:.1f}s\n")
+
+        return all_articles
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Benchmark categorization: one substring scan per keyword vs. a single Aho-Corasick pass
+(pure-Python automaton, and pyahocorasick batch mode when installed), and re-categorizing
+unchanged articles through the content-hash cache.
+
+Also checks that they produce identical scores for every category and identical categories.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from categorizer import ArticleCategorizer  # noqa: E402
+from category_cache import CategoryCache  # noqa: E402
+from config import CATEGORY_KEYWORDS  # noqa: E402
+from keyword_matcher import AHOCORASICK_AVAILABLE, KeywordAutomaton  # noqa: E402
+
+
+class PurePythonCategorizer(ArticleCategorizer):
+    """The single-pass categorizer with the pure-Python automaton even if pyahocorasick is installed."""
+
+    def __init__(self):
+        super().__init__(use_cache=False)
+
+    def _compile_keywords(self):
+        super()._compile_keywords()
+        self._automaton = KeywordAutomaton(self._automaton.keywords, use_native=False)
+
+
+class LegacyCategorizer(ArticleCategorizer):
+    """The pre-optimization implementation: `keyword in text` for every keyword of every category."""
+
+    def __init__(self):
+        super().__init__(use_cache=False)
+
+    def calculate_category_score(self, text, category):
+        if not text:
+            return 0.0
+        text_lower = text.lower()
+        keywords = self.keywords.get(category, [])
+        if not keywords:
+            return 0.0
+        return self.score_matches(sum(1 for keyword in keywords if keyword.lower() in text_lower))
+
+    def categorize_article(self, article):
+        full_text = " ".join([article.get("title", ""), article.get("summary", ""), article.get("full_content", "")])
+        if not full_text.strip():
+            return None
+        if self.calculate_category_score(full_text, "Cool Startups to watch") > 0.3:
+            return "Cool Startups to watch"
+        scores = {category: self.calculate_category_score(full_text, category) for category in self.keywords}
+        best_category = max(scores.items(), key=lambda x: x[1])
+        return best_category[0] if best_category[1] > 0.1 else None
+
+
+def make_articles(count: int, content_words: int, seed: int = 0):
+    """Articles mixing category keywords (in varied case, some glued to other words) with filler text."""
+    rng = random.Random(seed)
+    keywords = [keyword for words in CATEGORY_KEYWORDS.values() for keyword in words]
+    filler = "the a new of for with and its on to in launches says report team users model open".split()
+
+    def words(n, keyword_rate):
+        out = []
+        for _ in range(n):
+            if rng.random() < keyword_rate:
+                keyword = rng.choice(keywords)
+                out.append(rng.choice([keyword, keyword.upper(), keyword.title(), "x" + keyword + "s"]))
+            else:
+                out.append(rng.choice(filler))
+        return " ".join(out)
+
+    articles = []
+    for _ in range(count):
+        rate = rng.choice([0.0, 0.01, 0.05, 0.2])
+        articles.append({
+            "title": words(10, rate),
+            "summary": words(40, rate),
+            "full_content": words(content_words, rate) if content_words else "",
+        })
+    return articles
+
+
+def check_identical(legacy, fast, articles) -> int:
+    """Compare every category score and the chosen category; return the number of articles checked."""
+    for article in articles:
+        text = " ".join([article["title"], article["summary"], article["full_content"]])
+        for category in CATEGORY_KEYWORDS:
+            expected = legacy.calculate_category_score(text, category)
+            actual = fast.calculate_category_score(text, category)
+            assert expected == actual, (category, expected, actual, text[:200])
+        assert legacy.categorize_article(article) == fast.categorize_article(article), text[:200]
+    assert fast.categorize_batch(articles) == [legacy.categorize_article(article) for article in articles]
+    return len(articles)
+
+
+def one_by_one(categorizer):
+    return lambda articles: [categorizer.categorize_article(article) for article in articles]
+
+
+def time_per_article(make_func, articles, repeat: int = 3) -> float:
+    """Best-of-N microseconds per article, with a fresh categorizer (cold caches) each time."""
+    best = float("inf")
+    for _ in range(repeat):
+        func = make_func()
+        start = time.perf_counter()
+        func(articles)
+        best = min(best, time.perf_counter() - start)
+    return best / len(articles) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    legacy = LegacyCategorizer()
+    variants = [("pure Python", PurePythonCategorizer)]
+    if AHOCORASICK_AVAILABLE:
+        variants.append(("pyahocorasick", lambda: ArticleCategorizer(use_cache=False)))
+    else:
+        print("pyahocorasick not installed; timing the pure-Python automaton only\n")
+
+    checked = 0
+    for content_words in (0, 800):
+        articles = make_articles(count, content_words, seed=content_words)
+        for _, categorizer in variants:
+            checked += check_identical(legacy, categorizer(), articles)
+    print(f"Scores and categories identical for {checked} articles\n")
+
+    print(f"Categorizing {count} articles (µs per article)")
+    for label, content_words in (("title + summary", 0), ("with full content", 800)):
+        articles = make_articles(count, content_words, seed=1)
+        slow = time_per_article(lambda: one_by_one(LegacyCategorizer()), articles)
+        line = f"  {label:18} legacy {slow:8.1f}"
+        for name, categorizer in variants:
+            batch = time_per_article(lambda: categorizer().categorize_batch, articles)
+            line += f"   {name} {batch:8.1f} ({slow / batch:.1f}x)"
+        print(line)
+
+    print(f"\nRe-categorizing {count} unchanged articles (µs per article)")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, content_words in (("title + summary", 0), ("with full content", 800)):
+            articles = make_articles(count, content_words, seed=1)
+            cached = ArticleCategorizer(use_cache=False)
+            cached.cache = CategoryCache(path=os.path.join(directory, f"categories-{content_words}.db"))
+            expected = cached.categorize_batch(articles)
+            hits = time_per_article(lambda: cached.categorize_batch, articles)
+            assert cached.categorize_batch(articles) == expected
+            print(f"  {label:18} cache hits {hits:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark per-article cost of filter_recent_articles: legacy dateparser path vs. fast path."""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import NewsScraper  # noqa: E402
+
+
+def legacy_filter_recent_articles(articles, days=7):
+    """The pre-optimization implementation: dateparser on every published string."""
+    from dateparser import parse as parse_date
+
+    recent_articles = []
+    cutoff_date = datetime.now()
+    for article in articles:
+        published_str = article.get("published", "")
+        if published_str:
+            try:
+                published_date = parse_date(published_str)
+                if published_date:
+                    days_ago = (cutoff_date - published_date.replace(tzinfo=None)).days
+                    if days_ago <= days:
+                        article["days_ago"] = days_ago
+                        recent_articles.append(article)
+            except Exception:
+                recent_articles.append(article)
+        else:
+            recent_articles.append(article)
+    return recent_articles
+
+
+def make_articles(count: int, with_parsed: bool):
+    """Articles with the date formats seen across NEWS_SOURCES (RFC 822, ISO 8601 with and without Z)."""
+    now = datetime.now(timezone.utc)
+    articles = []
+    for i in range(count):
+        published = now - timedelta(hours=i * 3, minutes=i)
+        style = i % 4
+        if style == 0:
+            text = published.strftime("%a, %d %b %Y %H:%M:%S +0000")
+        elif style == 1:
+            text = published.strftime("%a, %d %b %Y %H:%M:%S GMT")
+        elif style == 2:
+            text = published.strftime("%Y-%m-%dT%H:%M:%SZ")
+        else:
+            text = published.isoformat()
+        article = {"title": f"Article {i}", "published": text}
+        if with_parsed:
+            article["published_ts"] = published.timestamp()
+        articles.append(article)
+    return articles
+
+
+def time_per_article(func, articles, repeat: int = 3) -> float:
+    """Best-of-N microseconds per article."""
+    best = float("inf")
+    for _ in range(repeat):
+        batch = [dict(article) for article in articles]
+        start = time.perf_counter()
+        func(batch)
+        best = min(best, time.perf_counter() - start)
+    return best / len(articles) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    scraper = NewsScraper(use_feed_cache=False, use_content_cache=False)
+
+    legacy = time_per_article(legacy_filter_recent_articles, make_articles(count, with_parsed=False))
+    strict = time_per_article(scraper.filter_recent_articles, make_articles(count, with_parsed=False))
+    parsed = time_per_article(scraper.filter_recent_articles, make_articles(count, with_parsed=True))
+
+    print(f"filter_recent_articles over {count} articles (µs per article)")
+    print(f"  legacy dateparser:            {legacy:10.1f}")
+    print(f"  strict RFC 822 / ISO 8601:    {strict:10.1f}  ({legacy / strict:.0f}x faster)")
+    print(f"  feedparser published_parsed: {parsed:10.1f}  ({legacy / parsed:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
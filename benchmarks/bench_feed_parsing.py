@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark feed parsing: full feedparser parse vs. streaming lxml parse that stops after N entries."""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import MAX_ARTICLES_PER_SOURCE  # noqa: E402
+from scraper import NewsScraper  # noqa: E402
+
+
+def make_rss(count: int) -> bytes:
+    """RSS 2.0 feed shaped like a large listing (long descriptions, content:encoded bodies)."""
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(count):
+        published = (now - timedelta(hours=i)).strftime("%a, %d %b %Y %H:%M:%S +0000")
+        body = escape(f"<p>Paper {i} studies transformer scaling on GPU clusters.</p>" * 20)
+        items.append(
+            f"<item><title>Paper {i}: scaling laws for model training</title>"
+            f"<link>https://example.com/papers/{i}</link><guid>urn:paper:{i}</guid>"
+            f"<pubDate>{published}</pubDate><description>{body}</description>"
+            f"<content:encoded>{body}</content:encoded></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        "<channel><title>Example Listing</title><link>https://example.com/</link><ttl>60</ttl>"
+        + "".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def make_atom(count: int) -> bytes:
+    """Atom feed with the same shape."""
+    now = datetime.now(timezone.utc)
+    entries = []
+    for i in range(count):
+        updated = (now - timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        body = escape(f"<p>Post {i} about an AI application.</p>" * 20)
+        entries.append(
+            f'<entry><title>Post {i}: shipping an LLM feature</title>'
+            f'<link rel="alternate" href="https://example.org/posts/{i}"/><id>tag:example.org,2024:{i}</id>'
+            f'<published>{updated}</published><updated>{updated}</updated>'
+            f'<summary type="html">{body}</summary></entry>'
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+        "<title>Example Blog</title><id>tag:example.org,2024:feed</id>"
+        + "".join(entries) + "</feed>"
+    ).encode("utf-8")
+
+
+def time_parse(scraper: NewsScraper, content: bytes, repeat: int = 5) -> float:
+    """Best-of-N milliseconds to turn feed bytes into articles."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scraper.parse_rss_feed(content, "https://example.com/feed", MAX_ARTICLES_PER_SOURCE)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    fast = NewsScraper(use_feed_cache=False, use_content_cache=False, track_health=False)
+    legacy = NewsScraper(use_feed_cache=False, use_content_cache=False, track_health=False,
+                         fast_feed_parser=False)
+
+    print(f"parse_rss_feed, {count}-entry feeds, first {MAX_ARTICLES_PER_SOURCE} articles kept (ms per feed)")
+    for name, content in (("RSS 2.0", make_rss(count)), ("Atom", make_atom(count))):
+        fast_articles = fast.parse_rss_feed(content, "https://example.com/feed", MAX_ARTICLES_PER_SOURCE)
+        legacy_articles = legacy.parse_rss_feed(content, "https://example.com/feed", MAX_ARTICLES_PER_SOURCE)
+        fields = ("title", "link", "guid", "published", "published_ts", "summary", "source")
+        same = [{key: a[key] for key in fields} for a in fast_articles] == \
+               [{key: a[key] for key in fields} for a in legacy_articles]
+
+        legacy_ms = time_parse(legacy, content)
+        fast_ms = time_parse(fast, content)
+        print(f"  {name:8} feedparser: {legacy_ms:8.1f}   lxml streaming: {fast_ms:6.2f}  "
+              f"({legacy_ms / fast_ms:.0f}x faster, same articles: {same})")
+
+
+if __name__ == "__main__":
+    main()
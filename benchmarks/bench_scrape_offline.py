@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Offline benchmark of scrape -> filter -> dedup -> categorize against recorded HTTP fixtures.
+
+    # Capture live feeds (and the first N article pages) into a fixture archive
+    python benchmarks/bench_scrape_offline.py record fixtures.zip --content 50
+
+    # Or generate a synthetic archive for NEWS_SOURCES (no network needed, e.g. in CI)
+    python benchmarks/bench_scrape_offline.py synthesize fixtures.zip
+
+    # Replay it from a local server with injected latency and failures
+    python benchmarks/bench_scrape_offline.py replay fixtures.zip --latency 0.05 \\
+        --host-latency export.arxiv.org=0.8 --failure-rate 0.02 --failure-mode reset
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from categorizer import ArticleCategorizer  # noqa: E402
+from config import NEWS_SOURCES, CATEGORY_KEYWORDS  # noqa: E402
+from dedup import ArticleDeduplicator  # noqa: E402
+from http_fixtures import FixtureArchive, RecordingFetcher, ReplayFetcher, ReplayServer  # noqa: E402
+from scraper import NewsScraper  # noqa: E402
+
+# Caches, health tracking and refresh hints would make repeated runs measure different work
+SCRAPER_OPTIONS = dict(use_feed_cache=False, use_content_cache=False, track_health=False,
+                       respect_refresh_hints=False)
+
+
+def record(args):
+    """Scrape the live sources through a RecordingFetcher and save the archive."""
+    archive = FixtureArchive()
+    # The threaded engine, since the async one bypasses the fetcher's fetch()
+    scraper = NewsScraper(fetcher=RecordingFetcher(archive), **SCRAPER_OPTIONS)
+    articles = scraper.scrape_all_sources()
+    if args.content:
+        scraper.fetch_contents(articles[:args.content])
+    archive.save(args.archive)
+    print(f"Recorded {len(archive.responses)} responses ({len(articles)} articles) to {args.archive}")
+
+
+# Keywords drawn from one category per item: none (uncategorized), one (ambiguous, so
+# tiered categorization refines it), two (just above the threshold) or several (clear-cut)
+KEYWORD_DENSITIES = (0, 1, 2, 4)
+# Neutral words that match no category keyword
+FILLER = "the a of for with and its on to in says report week today this after more".split()
+
+
+def _synthetic_text(rng: random.Random, keywords: list, length: int, matches: int) -> str:
+    """length filler words with `matches` keywords inserted at random positions."""
+    words = [rng.choice(FILLER) for _ in range(length)]
+    for keyword in rng.sample(keywords, min(matches, len(keywords))):
+        words.insert(rng.randrange(len(words) + 1), keyword)
+    return " ".join(words)
+
+
+def synthesize(args):
+    """Write an archive with generated RSS for every source and an HTML page per item.
+
+    Items are spread over all categories with varying keyword density, so the
+    categorizer sees a realistic mix of clear, ambiguous and uncategorized articles.
+    """
+    rng = random.Random(args.seed)
+    categories = list(CATEGORY_KEYWORDS)
+    now = datetime.now(timezone.utc)
+    archive = FixtureArchive()
+
+    for name, source in NEWS_SOURCES.items():
+        host = urlsplit(source["url"]).netloc
+        items = []
+        for i in range(args.items):
+            keywords = CATEGORY_KEYWORDS[rng.choice(categories)]
+            matches = rng.choice(KEYWORD_DENSITIES)
+            # Split the keywords between title and summary, at least one in the title when any
+            title_matches = (matches + 1) // 2
+            title = _synthetic_text(rng, keywords, 8, title_matches).capitalize()
+            link = f"https://{host}/{name}/{i}"
+            summary = _synthetic_text(rng, keywords, 40, matches - title_matches)
+            published = (now - timedelta(hours=i * 7 + rng.random())).strftime("%a, %d %b %Y %H:%M:%S +0000")
+            items.append(
+                f"<item><title>{escape(title)}</title><link>{link}</link><guid>{link}</guid>"
+                f"<pubDate>{published}</pubDate><description>{escape(summary)}</description></item>"
+            )
+            page = f"<html><body><nav>menu</nav><article><h1>{escape(title)}</h1>" + \
+                f"<p>{escape(summary)}</p>" * 30 + "</article></body></html>"
+            archive.add(link, 200, {"content-type": "text/html; charset=utf-8"}, page.encode("utf-8"))
+
+        feed = (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                f"<title>{escape(name)}</title><link>https://{host}/</link>" + "".join(items) +
+                "</channel></rss>")
+        headers = {"content-type": "application/rss+xml", "etag": f'"{name}-v1"'}
+        archive.add(source["url"], 200, headers, feed.encode("utf-8"))
+
+    archive.save(args.archive)
+    print(f"Synthesized {len(archive.responses)} responses for {len(NEWS_SOURCES)} sources in {args.archive}")
+
+
+def parse_host_values(pairs):
+    """["host=0.5", ...] -> {"host": 0.5}"""
+    values = {}
+    for pair in pairs or []:
+        host, _, value = pair.partition("=")
+        values[host] = float(value)
+    return values
+
+
+def replay(args):
+    """Time each pipeline stage against the archive served with the requested latency/failures."""
+    archive = FixtureArchive.load(args.archive)
+    # Recorded feeds age; widen the date window so the same articles pass the filter every time
+    days = 7 + int((time.time() - archive.recorded_at) // 86400)
+    timings = {"scrape": [], "filter": [], "dedup": [], "categorize": []}
+
+    for run in range(args.repeat):
+        server = ReplayServer(
+            archive,
+            latency=parse_host_values(args.host_latency),
+            default_latency=args.latency,
+            failure_rate=parse_host_values(args.host_failure_rate),
+            default_failure_rate=args.failure_rate,
+            failure_mode=args.failure_mode,
+            hang_seconds=args.hang,
+            seed=args.seed + run,
+        )
+        with server:
+            fetcher = ReplayFetcher(server)
+            if args.engine == "async":
+                from async_scraper import AsyncNewsScraper
+                scraper = AsyncNewsScraper(fetcher=fetcher, **SCRAPER_OPTIONS)
+            else:
+                scraper = NewsScraper(fetcher=fetcher, **SCRAPER_OPTIONS)
+
+            start = time.perf_counter()
+            articles = scraper.scrape_all_sources(fetch_full_content=args.full_content, deadline=args.deadline)
+            timings["scrape"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        recent = scraper.filter_recent_articles(articles, days=days)
+        timings["filter"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        unique = ArticleDeduplicator().deduplicate(recent)
+        timings["dedup"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        categorized, uncategorized = ArticleCategorizer(use_cache=False).categorize_articles(unique)
+        timings["categorize"].append(time.perf_counter() - start)
+
+        print(f"run {run + 1}: {len(articles)} articles, {len(recent)} recent, {len(unique)} unique, "
+              f"{sum(len(items) for items in categorized.values())} categorized, "
+              f"missing sources: {len(scraper.last_missing_sources)}, server: {server.stats}")
+
+    print(f"\nStage timings over {args.repeat} runs (seconds, median / best)")
+    for stage, values in timings.items():
+        print(f"  {stage:11} {statistics.median(values):8.3f} / {min(values):8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Capture live responses")
+    record_parser.add_argument("archive")
+    record_parser.add_argument("--content", type=int, default=0, help="Also record this many article pages")
+    record_parser.set_defaults(func=record)
+
+    synth_parser = commands.add_parser("synthesize", help="Generate a synthetic archive")
+    synth_parser.add_argument("archive")
+    synth_parser.add_argument("--items", type=int, default=20, help="Items per feed")
+    synth_parser.add_argument("--seed", type=int, default=0)
+    synth_parser.set_defaults(func=synthesize)
+
+    replay_parser = commands.add_parser("replay", help="Benchmark against an archive")
+    replay_parser.add_argument("archive")
+    replay_parser.add_argument("--engine", choices=["threads", "async"], default="threads")
+    replay_parser.add_argument("--repeat", type=int, default=3)
+    replay_parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    replay_parser.add_argument("--host-latency", nargs="*", metavar="HOST=SECONDS")
+    replay_parser.add_argument("--failure-rate", type=float, default=0.0, help="Probability a request fails")
+    replay_parser.add_argument("--host-failure-rate", nargs="*", metavar="HOST=RATE")
+    replay_parser.add_argument("--failure-mode", choices=["error", "reset", "timeout"], default="error")
+    replay_parser.add_argument("--hang", type=float, default=120.0, help="Seconds a 'timeout' failure stalls")
+    replay_parser.add_argument("--deadline", type=float, default=None, help="Scrape deadline in seconds")
+    replay_parser.add_argument("--full-content", action="store_true", help="Fetch article pages while scraping")
+    replay_parser.add_argument("--seed", type=int, default=0)
+    replay_parser.set_defaults(func=replay)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
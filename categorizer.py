@@ -1,29 +1,54 @@
 """Categorizes articles into GPU and AI Infra, AI Applications, AI Builder tools, and Cool Startups."""
 
-from typing import Dict, List, Optional
-from config import CATEGORY_KEYWORDS
+from typing import Dict, List, Optional, Tuple
+from category_cache import CategoryCache
+from config import CATEGORY_KEYWORDS, CATEGORY_AMBIGUOUS_BAND
+from keyword_matcher import KeywordAutomaton
 
 
 class ArticleCategorizer:
     """Categorizes articles based on content analysis."""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         self.keywords = CATEGORY_KEYWORDS
+        self._compile_keywords()
+        # Results for unchanged article texts, shared across runs and gunicorn workers
+        self.cache = CategoryCache(keywords=self.keywords) if use_cache else None
+    
+    def _compile_keywords(self):
+        """Build one automaton over every category's keywords (lowercased, each stored once).
+        
+        A keyword listed under several categories, or twice in one list, is found once
+        but counted once per listing, exactly like checking each list entry separately.
+        """
+        keyword_ids: Dict[str, int] = {}
+        self._keyword_categories: List[List[str]] = []
+        for category, keywords in self.keywords.items():
+            for keyword in keywords:
+                keyword_id = keyword_ids.setdefault(keyword.lower(), len(keyword_ids))
+                if keyword_id == len(self._keyword_categories):
+                    self._keyword_categories.append([])
+                self._keyword_categories[keyword_id].append(category)
+        self._automaton = KeywordAutomaton(keyword_ids)
+    
+    def count_keyword_matches(self, text: str) -> Dict[str, int]:
+        """Number of each category's keywords found in text (case-insensitive), in one scan."""
+        counts = {category: 0 for category in self.keywords}
+        for keyword_id in self._automaton.find(text.lower()):
+            for category in self._keyword_categories[keyword_id]:
+                counts[category] += 1
+        return counts
     
     def calculate_category_score(self, text: str, category: str) -> float:
         """Calculate how well an article matches a category."""
-        if not text:
-            return 0.0
-        
-        text_lower = text.lower()
-        keywords = self.keywords.get(category, [])
-        
-        if not keywords:
+        if not text or not self.keywords.get(category):
             return 0.0
         
-        # Count keyword matches (case-insensitive)
-        matches = sum(1 for keyword in keywords if keyword.lower() in text_lower)
-        
+        return self.score_matches(self.count_keyword_matches(text)[category])
+    
+    @staticmethod
+    def score_matches(matches: int) -> float:
+        """Category score for a number of matched keywords."""
         # Stricter scoring to ensure relevance
         # Require at least 2 keyword matches for good confidence
         if matches >= 2:
@@ -39,27 +64,51 @@ class ArticleCategorizer:
     
     def categorize_article(self, article: Dict) -> Optional[str]:
         """Categorize a single article."""
+        return self.classify_article(article)[0]
+    
+    def classify_article(self, article: Dict) -> Tuple[Optional[str], float]:
+        """Category of a single article and its score in that category (the confidence)."""
         # Combine title, summary, and content for analysis
+        full_text = self._article_text(article)
+        
+        if not full_text.strip():
+            return None, 0.0
+        
+        # One pass over the text counts matches for every category
+        return self._choose_category(self.count_keyword_matches(full_text))
+    
+    @staticmethod
+    def is_ambiguous(score: float) -> bool:
+        """Whether a category score is too weak to trust without the article's full content."""
+        low, high = CATEGORY_AMBIGUOUS_BAND
+        return low < score < high
+    
+    def category_confidence(self, article: Dict, category: str) -> float:
+        """Score of an article in a given category."""
+        return self.calculate_category_score(self._article_text(article), category)
+    
+    @staticmethod
+    def _article_text(article: Dict) -> str:
+        """Title, summary and content joined for analysis."""
         text_parts = [
             article.get("title", ""),
             article.get("summary", ""),
             article.get("full_content", "")
         ]
-        full_text = " ".join(text_parts)
-        
-        if not full_text.strip():
-            return None
-        
+        return " ".join(text_parts)
+    
+    def _choose_category(self, counts: Dict[str, int]) -> Tuple[Optional[str], float]:
+        """Best category for per-category keyword match counts (None below the threshold) and its score."""
         # PRIORITY CHECK: "Cool Startups to watch" first to avoid being captured by generic "AI Applications"
         # Articles from Product Hunt, Show HN, Indie Hackers should go here even if they mention AI
-        startup_score = self.calculate_category_score(full_text, "Cool Startups to watch")
+        startup_score = self.score_matches(counts.get("Cool Startups to watch", 0))
         if startup_score > 0.3:  # Strong startup signal - assign immediately
-            return "Cool Startups to watch"
+            return "Cool Startups to watch", startup_score
         
         # Calculate scores for each category
         scores = {}
         for category in self.keywords.keys():
-            scores[category] = self.calculate_category_score(full_text, category)
+            scores[category] = self.score_matches(counts[category])
         
         # Find the category with the highest score
         best_category = max(scores.items(), key=lambda x: x[1])
@@ -70,9 +119,39 @@ class ArticleCategorizer:
         
         # Only categorize if score is above threshold
         if best_category[1] > threshold:
-            return best_category[0]
+            return best_category
+        
+        return None, best_category[1]
+    
+    def categorize_batch(self, articles: List[Dict]) -> List[Optional[str]]:
+        """Category of each article (same result as categorize_article)."""
+        return [category for category, _ in self.classify_batch(articles)]
+    
+    def classify_batch(self, articles: List[Dict]) -> List[Tuple[Optional[str], float]]:
+        """classify_article for each article.
+        
+        Articles with identical text (syndicated copies) are matched once, and texts
+        categorized before are served from the cache without scoring. Uncached texts still
+        cost one automaton scan each: about 5x the per-keyword scan, not an order of magnitude.
+        """
+        texts = [self._article_text(article) for article in articles]
+        by_text: Dict[str, Tuple[Optional[str], float]] = {}
+        keys: Dict[str, str] = {}
+        if self.cache:
+            keys = {text: self.cache.input_hash(text) for text in set(texts)}
+            cached = self.cache.get_many(keys.values())
+            by_text = {text: cached[key] for text, key in keys.items() if key in cached}
+        
+        computed: Dict[str, Tuple[Optional[str], float]] = {}
+        for article, full_text in zip(articles, texts):
+            if full_text not in by_text:
+                by_text[full_text] = self.classify_article(article)
+                if self.cache:
+                    computed[keys[full_text]] = by_text[full_text]
         
-        return None
+        if self.cache:
+            self.cache.put_many(computed)
+        return [by_text[full_text] for full_text in texts]
     
     def categorize_articles(self, articles: List[Dict]) -> Dict[str, List[Dict]]:
         """Categorize multiple articles."""
@@ -85,10 +164,11 @@ class ArticleCategorizer:
         
         uncategorized = []
         
-        for article in articles:
-            category = self.categorize_article(article)
+        for article, (category, score) in zip(articles, self.classify_batch(articles)):
             if category and category in categorized:
                 article["category"] = category
+                # Confidence used when ranking articles within the category
+                article["category_score"] = score
                 categorized[category].append(article)
             else:
                 uncategorized.append(article)
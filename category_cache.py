@@ -0,0 +1,110 @@
+"""Persistent categorization results keyed by a hash of the article text and of the keyword lists."""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import CATEGORY_CACHE_FILE, CATEGORY_CACHE_MAX_ENTRIES, CATEGORY_KEYWORDS
+from storage import open_database, ensure_columns
+
+# LRU order only needs coarse timestamps: a hit rewrites accessed_at at most this often (seconds)
+TOUCH_INTERVAL = 3600
+
+
+def keywords_version(keywords: Dict[str, List[str]]) -> str:
+    """Hash of the category keyword lists; category order matters too (it breaks score ties)."""
+    return hashlib.sha256(json.dumps(keywords).encode("utf-8")).hexdigest()[:16]
+
+
+class CategoryCache:
+    """Remembers the category (or lack of one) and its score computed for an exact categorization input.
+
+    Keys include the keyword version, so editing CATEGORY_KEYWORDS makes every old
+    entry unreachable. The SQLite file is shared by all gunicorn workers, which may
+    run two keyword versions during a deploy, so rows of other versions are only
+    dropped once the cache is over max_entries: they go first, then the least
+    recently used entries.
+    """
+
+    def __init__(self, path: str = CATEGORY_CACHE_FILE, max_entries: int = CATEGORY_CACHE_MAX_ENTRIES,
+                 keywords: Dict[str, List[str]] = CATEGORY_KEYWORDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.version = keywords_version(keywords)
+        self._lock = threading.Lock()
+        self._conn = open_database(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS categories (
+                input_hash TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                category TEXT,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        ensure_columns(self._conn, "categories", {"score": "REAL"})
+        self._conn.execute("CREATE INDEX IF NOT EXISTS categories_accessed ON categories (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS categories_version ON categories (version)")
+
+    def input_hash(self, text: str) -> str:
+        """Cache key for a categorization input under the current keyword version."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get_many(self, input_hashes: Iterable[str]) -> Dict[str, Tuple[Optional[str], float]]:
+        """Cached (category, score) for the given keys; missing keys are absent (a None category
+        means uncategorized)."""
+        keys = list(input_hashes)
+        found = {}
+        if not keys:
+            return found
+        now = time.time()
+        stale = []
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in self._conn.execute(
+                        f"SELECT input_hash, category, score, accessed_at FROM categories "
+                        f"WHERE input_hash IN ({placeholders}) AND score IS NOT NULL", chunk):
+                    found[row["input_hash"]] = (row["category"], row["score"])
+                    if row["accessed_at"] < now - TOUCH_INTERVAL:
+                        stale.append((now, row["input_hash"]))
+            if stale:
+                self._conn.executemany("UPDATE categories SET accessed_at = ? WHERE input_hash = ?", stale)
+        return found
+
+    def put_many(self, results: Dict[str, Tuple[Optional[str], float]]):
+        """Store input hash -> (category, score) results and evict beyond max_entries."""
+        if not results:
+            return
+        now = time.time()
+        rows = [(key, self.version, category, score, now) for key, (category, score) in results.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO categories (input_hash, version, category, score, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop entries beyond max_entries, other keyword versions first, then least recently used (lock held)."""
+        total = self._conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0]
+        if total <= self.max_entries:
+            return
+        # Two ranges rather than != so SQLite can use the version index
+        total -= self._conn.execute(
+            "DELETE FROM categories WHERE version < ? OR version > ?", (self.version, self.version)
+        ).rowcount
+        if total > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM categories WHERE input_hash IN "
+                "(SELECT input_hash FROM categories ORDER BY accessed_at LIMIT ?)",
+                (total - self.max_entries,)
+            )
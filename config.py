@@ -733,4 +733,78 @@ CATEGORY_KEYWORDS = {
 MAX_ARTICLES_PER_SOURCE = 2  # Reduced to 2 for faster scraping (54 sources)
 REQUEST_TIMEOUT = 5  # Aggressive timeout for Railway - fail fast
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-RATE_LIMIT_DELAY = 0.1  # Reduced delay between sources (0.1s instead of 0.3s for speed)
\ No newline at end of file
+RATE_LIMIT_DELAY = 0.1  # Reduced delay between sources (0.1s instead of 0.3s for speed)
+TOP_ARTICLES_PER_CATEGORY = 10  # Articles per category sent to the summarizer
+# Two-tier categorization: articles whose title/summary score lies strictly inside this band
+# (a single keyword match scores 0.15) are re-categorized after fetching their full content
+CATEGORY_AMBIGUOUS_BAND = (0.1, 0.4)
+TIERED_CATEGORIZATION = os.getenv("TIERED_CATEGORIZATION", "True").lower() == "true"
+# Ranking of those articles: weighted category confidence, recency and source quality (each 0-1)
+RANK_WEIGHTS = {"confidence": 0.5, "recency": 0.3, "source": 0.2}
+RANK_RECENCY_HALF_LIFE = 2 * 24 * 3600  # Seconds for an article's recency score to halve
+RANK_ORIGINAL_SOURCE_SCORE = 0.8  # Source score of an original publisher
+RANK_AGGREGATOR_SOURCE_SCORE = 0.5  # Source score of AGGREGATOR_SOURCES (link aggregators, newsletters)
+RANK_COVERAGE_BONUS = 0.1  # Source score added per other source carrying the same story (capped at 1.0)
+RUN_DEADLINE = float(os.getenv("RUN_DEADLINE", "0")) or None  # Scraping deadline in seconds (unset = wait for all)
+CONTENT_FETCH_WORKERS = 8  # Concurrent article page downloads in the lazy content stage
+MAX_CONTENT_CHARS = 5000  # Article text kept per page (summarizer truncates to 4000 anyway)
+CONTENT_MAX_BYTES = 512 * 1024  # Stop downloading an article page after this many bytes
+# HTTP Fetch Layer Configuration
+CONNECT_TIMEOUT = 3  # Seconds to establish a TCP/TLS connection
+READ_TIMEOUT = REQUEST_TIMEOUT  # Max seconds between bytes received from the server
+TOTAL_FETCH_TIMEOUT = REQUEST_TIMEOUT * 2  # Hard wall-clock cap for a single download
+HOST_MAX_CONNECTIONS = 6  # Concurrent requests per host for hosts not listed below
+# Hosts shared by several sources plus the article pages they link to (subdomains included)
+HOST_CONNECTION_LIMITS = {
+    "arxiv.org": 1,
+    "hnrss.org": 2,
+    "producthunt.com": 2,
+    "techcrunch.com": 4,
+}
+POOL_CONNECTIONS = 100  # Number of per-host connection pools kept alive
+# Keep-alive connections per host; never below a host's cap, so no "pool is full" discards
+POOL_MAXSIZE = max(HOST_MAX_CONNECTIONS, *HOST_CONNECTION_LIMITS.values())
+
+# Cache Configuration (SQLite files shared across runs and gunicorn workers)
+CACHE_DIR = os.getenv("CACHE_DIR", "data")
+FEED_CACHE_FILE = os.getenv("FEED_CACHE_FILE", os.path.join(CACHE_DIR, "feed_cache.db"))
+CONTENT_CACHE_FILE = os.getenv("CONTENT_CACHE_FILE", os.path.join(CACHE_DIR, "content_cache.db"))
+CONTENT_CACHE_TTL = 7 * 24 * 3600  # Seconds before cached article text is refetched
+CONTENT_CACHE_MAX_BYTES = 50 * 1024 * 1024  # LRU eviction keeps cached text under this size
+SOURCE_HEALTH_FILE = os.getenv("SOURCE_HEALTH_FILE", os.path.join(CACHE_DIR, "source_health.db"))
+WATERMARK_FILE = os.getenv("WATERMARK_FILE", os.path.join(CACHE_DIR, "watermarks.db"))
+SEEN_STORE_FILE = os.getenv("SEEN_STORE_FILE", os.path.join(CACHE_DIR, "seen_articles.db"))
+SEEN_RETENTION = 30 * 24 * 3600  # Seconds an article not seen again is remembered
+SEEN_BLOOM_CAPACITY = 200000  # Articles the in-memory Bloom filter is sized for
+SEEN_BLOOM_ERROR_RATE = 0.01  # Bloom false-positive rate (false positives cost one index lookup)
+CATEGORY_CACHE_FILE = os.getenv("CATEGORY_CACHE_FILE", os.path.join(CACHE_DIR, "category_cache.db"))
+CATEGORY_CACHE_MAX_ENTRIES = 100000  # LRU eviction keeps this many categorization results
+INCREMENTAL_SCRAPING = os.getenv("INCREMENTAL_SCRAPING", "False").lower() == "true"  # Only process items newer than the last run
+
+# Source Health Configuration
+HEALTH_WINDOW = 20  # Recent fetch outcomes kept per source
+CIRCUIT_FAILURE_THRESHOLD = 3  # Consecutive failures before a source's circuit opens
+CIRCUIT_COOLDOWN = 30 * 60  # Seconds a failing source is skipped before a probe fetch
+MIN_SOURCE_TIMEOUT = 2  # Floor for per-source adaptive timeouts (seconds)
+TIMEOUT_P95_MULTIPLIER = 2.0  # Per-source timeout = observed p95 latency x this (capped at TOTAL_FETCH_TIMEOUT)
+EMPTY_SOURCE_RUNS = 5  # Runs in a row without useful articles before a source is fetched less often
+EMPTY_SOURCE_INTERVAL = 6 * 3600  # Seconds between fetches of a chronically empty source
+MIN_REFRESH_INTERVAL = 5 * 60  # Shortest poll interval derived from a feed's refresh hints
+MAX_REFRESH_INTERVAL = 12 * 3600  # Longest a feed is left unpolled, whatever its hints say
+REFRESH_CADENCE_ITEMS = 20  # Items whose dates are read to estimate a feed's publishing cadence
+
+# Deduplication Configuration
+SIMHASH_MAX_DISTANCE = 3  # Max differing bits (of 64) for two titles/summaries to count as the same story
+SIMHASH_MIN_TOKENS = 5  # Titles shorter than this are too generic to fingerprint
+# Link aggregators and newsletters: when a story appears elsewhere too, the original publisher's copy is kept
+AGGREGATOR_SOURCES = {
+    "hacker_news", "hacker_news_show", "tldr_ai", "the_rundown_ai", "bens_bites", "mindstream",
+    "superhuman_newsletter", "the_ai_report", "medium_ai", "dev_to_ai", "hackernoon_ai",
+}
+
+# Scraping Engine Configuration
+SCRAPER_ENGINE = os.getenv("SCRAPER_ENGINE", "threads")  # "threads" or "async"
+ASYNC_MAX_CONCURRENCY = 200  # Max in-flight HTTP requests for the async engine
+ASYNC_LIMIT_PER_HOST = 0  # aiohttp connector cap per host:port (0 = none; per-host caps come from HOST_CONNECTION_LIMITS)
+PARSE_WORKERS = 4  # Executor size for CPU-bound feed/HTML parsing in the async engine
+PARSE_PROCESSES = int(os.getenv("PARSE_PROCESSES", min(4, os.cpu_count() or 1)))  # feedparser/BeautifulSoup worker processes (0 = parse in-thread)
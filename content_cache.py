@@ -0,0 +1,79 @@
+"""Persistent article content cache keyed by canonical URL, with TTL and size-bounded LRU eviction."""
+
+import hashlib
+import threading
+import time
+from typing import Optional
+
+from config import CONTENT_CACHE_FILE, CONTENT_CACHE_TTL, CONTENT_CACHE_MAX_BYTES
+from storage import open_database
+from url_utils import canonicalize_url
+
+
+class ContentCache:
+    """Stores extracted article text so already-seen pages are never downloaded twice."""
+
+    def __init__(self, path: str = CONTENT_CACHE_FILE, ttl: float = CONTENT_CACHE_TTL,
+                 max_bytes: int = CONTENT_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = open_database(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS contents (
+                url TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS contents_accessed ON contents (accessed_at)")
+
+    def get(self, url: str) -> Optional[str]:
+        """Return cached text for a URL, or None if missing or older than the TTL."""
+        key = canonicalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, fetched_at FROM contents WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row["fetched_at"] > self.ttl:
+                self._conn.execute("DELETE FROM contents WHERE url = ?", (key,))
+                return None
+            self._conn.execute("UPDATE contents SET accessed_at = ? WHERE url = ?", (now, key))
+        return row["content"]
+
+    def put(self, url: str, content: str):
+        """Store extracted text for a URL and evict least recently used entries over the size limit."""
+        key = canonicalize_url(url)
+        encoded = content.encode("utf-8")
+        content_hash = hashlib.sha256(encoded).hexdigest()
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO contents (url, content, content_hash, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, content, content_hash, len(encoded), now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones until under max_bytes (lock held)."""
+        self._conn.execute("DELETE FROM contents WHERE fetched_at < ?", (now - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM contents").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        doomed = []
+        for row in self._conn.execute("SELECT url, size FROM contents ORDER BY accessed_at"):
+            doomed.append((row["url"],))
+            excess -= row["size"]
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM contents WHERE url = ?", doomed)
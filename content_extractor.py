@@ -0,0 +1,121 @@
+"""Fast lxml-based article text extraction, including an incremental mode for streamed downloads."""
+
+from typing import Optional
+
+from config import MAX_CONTENT_CHARS
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Same boilerplate and content selectors as the BeautifulSoup extractor in scraper.py
+REMOVED_TAGS = ("script", "style", "nav", "header", "footer")
+CONTENT_CLASSES = ("article-content", "post-content", "entry-content", "content")
+CONTENT_XPATHS = (
+    "//article",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' article-content ')]",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' post-content ')]",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' entry-content ')]",
+    "//main",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' content ')]",
+)
+
+# Without a recognizable content container, keep reading until the page has
+# produced this many times the text we keep, so the body fallback is not cut short
+BODY_TEXT_FACTOR = 3
+
+
+def _clean_text(text: str, max_chars: int) -> Optional[str]:
+    """Collapse whitespace and apply the content length limit."""
+    text = " ".join(text.split())
+    if not text:
+        return None
+    if len(text) > max_chars:
+        text = text[:max_chars] + "..."
+    return text
+
+
+def extract_text_from_tree(root, max_chars: int = MAX_CONTENT_CHARS) -> Optional[str]:
+    """Extract main text from a parsed lxml HTML tree."""
+    if root is None:
+        return None
+
+    etree.strip_elements(root, etree.Comment, *REMOVED_TAGS, with_tail=False)
+
+    for xpath in CONTENT_XPATHS:
+        matches = root.xpath(xpath)
+        if matches:
+            return _clean_text(" ".join(matches[0].itertext()), max_chars)
+
+    # Fallback to body if no specific content found
+    body = root.find(".//body")
+    if body is not None:
+        return _clean_text(" ".join(body.itertext()), max_chars)
+    return None
+
+
+def extract_text_lxml(html: bytes, max_chars: int = MAX_CONTENT_CHARS) -> Optional[str]:
+    """Parse an HTML document with lxml and extract its main text."""
+    if not html:
+        return None
+    root = etree.fromstring(html, etree.HTMLParser())
+    return extract_text_from_tree(root, max_chars)
+
+
+def _is_content_container(element) -> bool:
+    """Whether an element matches one of the content selectors."""
+    if element.tag in ("article", "main"):
+        return True
+    classes = (element.get("class") or "").split()
+    return any(name in classes for name in CONTENT_CLASSES)
+
+
+class StreamingTextExtractor:
+    """Parses an HTML download chunk by chunk and reports once enough body text has arrived."""
+
+    def __init__(self, max_chars: int = MAX_CONTENT_CHARS):
+        self.max_chars = max_chars
+        self._parser = etree.HTMLPullParser(events=("start", "end"))
+        self._skip_depth = 0
+        self._container_depth = 0
+        self._container_chars = 0
+        self._body_chars = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Feed a downloaded chunk; returns True when the download can stop."""
+        self._parser.feed(chunk)
+        for event, element in self._parser.read_events():
+            if not isinstance(element.tag, str):
+                continue  # Comments and processing instructions
+            if event == "start":
+                if element.tag in REMOVED_TAGS:
+                    self._skip_depth += 1
+                elif _is_content_container(element):
+                    self._container_depth += 1
+                continue
+
+            if element.tag in REMOVED_TAGS:
+                self._skip_depth -= 1
+                continue
+            if self._skip_depth:
+                continue
+
+            text_length = len(element.text or "") + len(element.tail or "")
+            self._body_chars += text_length
+            if _is_content_container(element):
+                self._container_depth -= 1
+            elif self._container_depth:
+                self._container_chars += text_length
+
+        return (self._container_chars >= self.max_chars
+                or self._body_chars >= self.max_chars * BODY_TEXT_FACTOR)
+
+    def extract(self) -> Optional[str]:
+        """Finish parsing whatever was downloaded and extract the main text."""
+        try:
+            root = self._parser.close()
+        except etree.XMLSyntaxError:
+            return None
+        return extract_text_from_tree(root, self.max_chars)
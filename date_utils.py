@@ -0,0 +1,57 @@
+"""Fast publish-date parsing: structured feed tuples first, strict formats next, dateparser last."""
+
+import calendar
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional
+
+
+def struct_to_timestamp(parsed) -> Optional[float]:
+    """Convert feedparser's UTC time.struct_time (published_parsed/updated_parsed) to epoch seconds."""
+    if not parsed:
+        return None
+    try:
+        return float(calendar.timegm(parsed))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _to_timestamp(value: datetime) -> float:
+    """Epoch seconds; naive datetimes are taken as local time like the old parser assumed."""
+    return value.timestamp()
+
+
+def parse_strict(value: str) -> Optional[float]:
+    """Parse RFC 822 (RSS) or ISO 8601 (Atom) dates without any heuristics."""
+    try:
+        return _to_timestamp(parsedate_to_datetime(value))
+    except (TypeError, ValueError, IndexError, OverflowError):
+        pass
+    if value.endswith(("Z", "z")):
+        # fromisoformat only accepts a trailing "Z" from Python 3.11 on
+        value = value[:-1] + "+00:00"
+    try:
+        return _to_timestamp(datetime.fromisoformat(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_with_dateparser(value: str) -> Optional[float]:
+    """Slow fuzzy parsing, memoized because feeds repeat the same strings run after run."""
+    from dateparser import parse as parse_date
+
+    parsed = parse_date(value)
+    return _to_timestamp(parsed) if parsed else None
+
+
+def parse_timestamp(value: str) -> Optional[float]:
+    """Parse a published date string to epoch seconds, or None if it is not a date."""
+    if not value:
+        return None
+    value = value.strip()
+    timestamp = parse_strict(value)
+    if timestamp is None:
+        timestamp = _parse_with_dateparser(value)
+    return timestamp
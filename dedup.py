@@ -0,0 +1,168 @@
+"""Cross-source deduplication: canonical URLs plus SimHash near-duplicate titles and summaries."""
+
+import hashlib
+import html
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from config import SIMHASH_MAX_DISTANCE, SIMHASH_MIN_TOKENS, AGGREGATOR_SOURCES
+from url_utils import canonicalize_url
+
+FINGERPRINT_BITS = 64
+# Fingerprints within SIMHASH_MAX_DISTANCE bits share at least one band exactly
+# (pigeonhole), so candidates are found by band lookups instead of all-pairs comparison
+BANDS = SIMHASH_MAX_DISTANCE + 1
+BAND_BITS = FINGERPRINT_BITS // BANDS
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+TOKEN_PATTERN = re.compile(r"\w+")
+# Summaries beyond this many characters add cost without changing the fingerprint much
+MAX_TEXT_CHARS = 1000
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a title/summary with HTML tags and entities removed."""
+    text = html.unescape(TAG_PATTERN.sub(" ", text or ""))
+    return TOKEN_PATTERN.findall(text[:MAX_TEXT_CHARS].lower())
+
+
+# Each hash bit gets its own 16-bit counter lane inside one big int, so summing the
+# features' lane vectors counts all 64 bit positions at once
+LANE_BITS = 16
+LANE_MASK = (1 << LANE_BITS) - 1
+# BYTE_LANES[i][value]: lane vector of byte value at position i of a big-endian 8-byte digest
+BYTE_LANES = [
+    [sum(1 << ((8 * (7 - position) + bit) * LANE_BITS) for bit in range(8) if value >> bit & 1)
+     for value in range(256)]
+    for position in range(8)
+]
+
+
+@lru_cache(maxsize=65536)
+def _feature_lanes(feature: str) -> int:
+    """Lane vector of a feature's 64-bit hash (memoized: vocabulary repeats across articles)."""
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return sum(map(list.__getitem__, BYTE_LANES, digest))
+
+
+def simhash(tokens: List[str]) -> int:
+    """64-bit SimHash over word unigrams and bigrams."""
+    features = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    if not features:
+        return 0
+    counts = sum(map(_feature_lanes, features))
+    half = len(features) / 2
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if (counts >> (bit * LANE_BITS)) & LANE_MASK > half:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(first ^ second).count("1")
+
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    """(band index, band value) keys of a fingerprint."""
+    mask = (1 << BAND_BITS) - 1
+    return [(band, (fingerprint >> (band * BAND_BITS)) & mask) for band in range(BANDS)]
+
+
+def _url_key(url: str) -> str:
+    """Canonical URL with any leading www. dropped (amp./www. variants of one page)."""
+    canonical = canonicalize_url(url)
+    return canonical.replace("://www.", "://", 1)
+
+
+def source_quality(article: Dict) -> Tuple:
+    """Sort key for picking the copy to keep: original publishers over aggregators and
+    newsletters, then the richer summary, then the earliest publication."""
+    published_ts = article.get("published_ts")
+    return (
+        article.get("source_id") not in AGGREGATOR_SOURCES,
+        min(len(article.get("summary") or ""), MAX_TEXT_CHARS),
+        -(published_ts if published_ts is not None else float("inf")),
+    )
+
+
+class ArticleDeduplicator:
+    """Groups copies of the same story (same canonical URL or near-identical title/summary)."""
+
+    def __init__(self, max_distance: int = SIMHASH_MAX_DISTANCE, min_tokens: int = SIMHASH_MIN_TOKENS):
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self.reset()
+
+    def reset(self):
+        """Forget all articles seen so far."""
+        self._groups: List[List[Dict]] = []
+        self._by_url: Dict[str, int] = {}
+        self._bands: Dict[Tuple[str, int, int], List[Tuple[int, int, Optional[str]]]] = {}
+
+    def _fingerprints(self, article: Dict) -> List[Tuple[str, int]]:
+        """("title" / "text", fingerprint) pairs for texts long enough to be distinctive."""
+        fingerprints = []
+        title_tokens = tokenize(article.get("title", ""))
+        if len(title_tokens) >= self.min_tokens:
+            fingerprints.append(("title", simhash(title_tokens)))
+        text_tokens = title_tokens + tokenize(article.get("summary", ""))
+        if len(text_tokens) >= self.min_tokens * 2:
+            fingerprints.append(("text", simhash(text_tokens)))
+        return fingerprints
+
+    def _find_group(self, url_key: str, fingerprints: List[Tuple[str, int]], source_id: Optional[str]) -> Optional[int]:
+        """Index of the group this article belongs to, or None if it is a new story."""
+        if url_key and url_key in self._by_url:
+            return self._by_url[url_key]
+        for kind, fingerprint in fingerprints:
+            for band, value in _bands(fingerprint):
+                for other, group, other_source in self._bands.get((kind, band, value), ()):
+                    # A source repeating a title (weekly roundups) is not a duplicate; URL matches cover reposts
+                    if other_source == source_id:
+                        continue
+                    if hamming_distance(fingerprint, other) <= self.max_distance:
+                        return group
+        return None
+
+    def add(self, article: Dict) -> Optional[Dict]:
+        """Register an article; return the earlier article it duplicates, or None if it is new."""
+        url_key = _url_key(article.get("link", ""))
+        fingerprints = self._fingerprints(article)
+        source_id = article.get("source_id")
+
+        group = self._find_group(url_key, fingerprints, source_id)
+        duplicate_of = None
+        if group is None:
+            group = len(self._groups)
+            self._groups.append([article])
+        else:
+            duplicate_of = self._groups[group][0]
+            self._groups[group].append(article)
+
+        if url_key:
+            self._by_url.setdefault(url_key, group)
+        for kind, fingerprint in fingerprints:
+            for band, value in _bands(fingerprint):
+                self._bands.setdefault((kind, band, value), []).append((fingerprint, group, source_id))
+        return duplicate_of
+
+    def deduplicate(self, articles: List[Dict]) -> List[Dict]:
+        """Keep the best copy of each story, in order of first appearance.
+
+        The kept article lists the other sources in "duplicate_sources".
+        """
+        self.reset()
+        for article in articles:
+            self.add(article)
+
+        unique = []
+        for group in self._groups:
+            best = max(group, key=source_quality)
+            others = [article.get("source_id") or article.get("source") for article in group if article is not best]
+            if others:
+                best["duplicate_sources"] = others
+            unique.append(best)
+        return unique
@@ -0,0 +1,82 @@
+"""Persistent HTTP validator cache (ETag / Last-Modified) for RSS feeds."""
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import FEED_CACHE_FILE
+from storage import open_database, ensure_columns
+
+
+class FeedCache:
+    """Stores each feed's validators and last parsed articles for conditional GETs."""
+
+    def __init__(self, path: str = FEED_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = open_database(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS feeds (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                max_items INTEGER NOT NULL,
+                articles TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                checked_at REAL NOT NULL
+            )
+        """)
+        ensure_columns(self._conn, "feeds", {
+            "refresh_interval": "REAL NOT NULL DEFAULT 0",
+            "next_due_at": "REAL NOT NULL DEFAULT 0",
+        })
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for a feed URL, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM feeds WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "url": row["url"],
+            "etag": row["etag"],
+            "last_modified": row["last_modified"],
+            "max_items": row["max_items"],
+            "articles": json.loads(row["articles"]),
+            "fetched_at": row["fetched_at"],
+            "checked_at": row["checked_at"],
+            "refresh_interval": row["refresh_interval"],
+            "next_due_at": row["next_due_at"],
+        }
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from a cached entry."""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str],
+              articles: List[Dict], max_items: int, refresh_interval: float = 0.0):
+        """Save validators, parsed articles and the next poll time after a full (200) download."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feeds (url, etag, last_modified, max_items, articles, fetched_at, "
+                "checked_at, refresh_interval, next_due_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, max_items, json.dumps(articles, ensure_ascii=False), now, now,
+                 refresh_interval, now + refresh_interval)
+            )
+
+    def touch(self, url: str):
+        """Record that the server confirmed the cached copy is still current (304)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE feeds SET checked_at = ?, next_due_at = ? + refresh_interval WHERE url = ?",
+                (now, now, url)
+            )
@@ -0,0 +1,248 @@
+"""Feed parsing: streaming lxml for plain RSS 2.0 / Atom with an early stop, feedparser for everything else."""
+
+import copy
+import io
+from typing import Dict, Optional
+from urllib.parse import urljoin
+from xml.sax.saxutils import escape
+
+import feedparser
+
+from date_utils import parse_strict, struct_to_timestamp
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# feedparser internals the fast path cleans summaries with, so its output matches
+# the fallback; a feedparser release without them sends every feed to the fallback
+try:
+    from feedparser.sanitizer import _sanitize_html
+    from feedparser.urls import resolve_relative_uris
+    SANITIZER_AVAILABLE = True
+except ImportError:
+    SANITIZER_AVAILABLE = False
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+SY_NS = "{http://purl.org/rss/1.0/modules/syndication/}"
+
+RSS_ITEM = "item"
+ATOM_ENTRY = ATOM_NS + "entry"
+
+# Atom text construct types (RFC 4287 3.1) as the MIME types feedparser maps them to
+ATOM_CONTENT_TYPES = {"text": "text/plain", "html": "text/html", "xhtml": "application/xhtml+xml"}
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+
+
+class UnsupportedFeed(Exception):
+    """The document is not plain RSS 2.0 / Atom (or not well-formed); use feedparser instead."""
+
+
+def _text(element) -> str:
+    """Stripped text of an element, or "" when missing."""
+    if element is None or element.text is None:
+        return ""
+    return element.text.strip()
+
+
+def _clean_html(html: str, base_url: str, content_type: str = "text/html") -> str:
+    """Resolve relative links and drop unsafe markup (scripts, event handlers), exactly as feedparser does."""
+    if not html:
+        return ""
+    html = resolve_relative_uris(html, base_url, "utf-8", content_type)
+    return _sanitize_html(html, "utf-8", content_type).strip()
+
+
+def _xhtml_markup(element) -> str:
+    """Inner markup of an Atom type="xhtml" construct, without the wrapping <div> and namespaces."""
+    children = list(element)
+    if (len(children) == 1 and etree.QName(children[0]).localname == "div"
+            and not (element.text or "").strip() and not (children[0].tail or "").strip()):
+        element = children[0]
+    element = copy.deepcopy(element)
+    for node in element.iter():
+        if isinstance(node.tag, str):
+            node.tag = etree.QName(node).localname
+    etree.cleanup_namespaces(element)
+    markup = escape(element.text or "") + "".join(etree.tostring(child, encoding="unicode") for child in element)
+    return markup.strip()
+
+
+def _atom_content(element, base_url: str) -> str:
+    """Text of an Atom summary/content: plain text as-is, HTML and XHTML sanitized."""
+    if element is None:
+        return ""
+    content_type = element.get("type", "text")
+    content_type = ATOM_CONTENT_TYPES.get(content_type, content_type)
+    if content_type == "application/xhtml+xml":
+        return _clean_html(_xhtml_markup(element), base_url, content_type)
+    if content_type in HTML_TYPES:
+        return _clean_html(_text(element), base_url, content_type)
+    return _text(element)
+
+
+def _atom_link(entry) -> str:
+    """href of the entry's alternate link (the first link without rel counts as alternate)."""
+    fallback = ""
+    for link in entry.iterfind(ATOM_NS + "link"):
+        href = link.get("href", "").strip()
+        if link.get("rel", "alternate") == "alternate" and href:
+            return href
+        fallback = fallback or href
+    return fallback
+
+
+def _rss_timestamp(item) -> Optional[float]:
+    """Epoch seconds of an RSS 2.0 <item>'s pubDate, falling back to dc:date."""
+    # feedparser reports dc:date as "updated"; it only dates the item
+    timestamp_source = _text(item.find("pubDate")) or _text(item.find(DC_NS + "date"))
+    return parse_strict(timestamp_source) if timestamp_source else None
+
+
+def _atom_timestamp(entry) -> Optional[float]:
+    """Epoch seconds of an Atom <entry>'s published date, falling back to updated."""
+    timestamp_source = _text(entry.find(ATOM_NS + "published")) or _text(entry.find(ATOM_NS + "updated"))
+    return parse_strict(timestamp_source) if timestamp_source else None
+
+
+def _rss_entry(item, base_url: str) -> Dict:
+    """Extract the fields the scraper uses from an RSS 2.0 <item>."""
+    published = _text(item.find("pubDate"))
+    link = _text(item.find("link"))
+    guid_element = item.find("guid")
+    guid = _text(guid_element)
+    if guid and guid_element.get("isPermaLink", "true") == "true":
+        # A permalink guid is a URL, and doubles as the link when there is none
+        guid = urljoin(base_url, guid)
+        link = link or guid
+    summary = _text(item.find("description")) or _text(item.find(CONTENT_NS + "encoded"))
+    return {
+        "title": _text(item.find("title")),
+        "link": urljoin(base_url, link) if link else "",
+        "id": guid or link,
+        "published": published,
+        "published_ts": _rss_timestamp(item),
+        "summary": _clean_html(summary, base_url),
+    }
+
+
+def _atom_entry(entry, base_url: str) -> Dict:
+    """Extract the fields the scraper uses from an Atom <entry>."""
+    published = _text(entry.find(ATOM_NS + "published"))
+    link = _atom_link(entry)
+    return {
+        "title": _text(entry.find(ATOM_NS + "title")),
+        "link": urljoin(base_url, link) if link else "",
+        "id": _text(entry.find(ATOM_NS + "id")) or link,
+        "published": published,
+        "published_ts": _atom_timestamp(entry),
+        "summary": (_atom_content(entry.find(ATOM_NS + "summary"), base_url)
+                    or _atom_content(entry.find(ATOM_NS + "content"), base_url)),
+    }
+
+
+def parse_feed_fast(content: bytes, base_url: str, max_entries: int, max_timestamps: int = 0) -> Dict:
+    """Parse the channel metadata and the first max_entries items of an RSS 2.0 / Atom feed.
+
+    Only the dates of later items are read, up to max_timestamps items in all, for
+    item_timestamps (the publishing cadence). Parsing stops as soon as both are done,
+    so long feeds are never fully built. Raises UnsupportedFeed for RSS 1.0/RDF, Atom 0.3, malformed XML and
+    anything else feedparser's lenient parser should handle.
+    """
+    if not LXML_AVAILABLE:
+        raise UnsupportedFeed("lxml is not installed")
+    if not SANITIZER_AVAILABLE:
+        raise UnsupportedFeed("this feedparser version lacks the sanitizer helpers")
+
+    feed = {"title": None, "ttl": None, "update_period": None, "update_frequency": None,
+            "entries": [], "item_timestamps": []}
+    wanted_timestamps = max(max_entries, max_timestamps)
+    entry_tag = None
+    depth = 0
+    in_entry = False
+    try:
+        for event, element in etree.iterparse(io.BytesIO(content), events=("start", "end"),
+                                              resolve_entities=False, no_network=True):
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    if element.tag == "rss":
+                        entry_tag = RSS_ITEM
+                    elif element.tag == ATOM_NS + "feed":
+                        entry_tag = ATOM_ENTRY
+                    else:
+                        raise UnsupportedFeed(f"unsupported root element {element.tag}")
+                elif element.tag == entry_tag:
+                    in_entry = True
+                continue
+
+            depth -= 1
+            if element.tag == entry_tag:
+                in_entry = False
+                if len(feed["entries"]) < max_entries:
+                    parse_entry = _rss_entry if entry_tag == RSS_ITEM else _atom_entry
+                    entry = parse_entry(element, base_url)
+                    feed["entries"].append(entry)
+                    feed["item_timestamps"].append(entry["published_ts"])
+                else:
+                    parse_timestamp = _rss_timestamp if entry_tag == RSS_ITEM else _atom_timestamp
+                    feed["item_timestamps"].append(parse_timestamp(element))
+                if len(feed["item_timestamps"]) >= wanted_timestamps:
+                    break
+                # Entries already extracted are no longer needed in the tree
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            elif not in_entry:
+                tag = element.tag
+                if tag in ("title", ATOM_NS + "title") and feed["title"] is None:
+                    feed["title"] = _text(element)
+                elif tag == "ttl":
+                    feed["ttl"] = _text(element)
+                elif tag == SY_NS + "updatePeriod":
+                    feed["update_period"] = _text(element)
+                elif tag == SY_NS + "updateFrequency":
+                    feed["update_frequency"] = _text(element)
+    except etree.XMLSyntaxError as e:
+        raise UnsupportedFeed(str(e)) from e
+
+    if entry_tag is None:
+        raise UnsupportedFeed("empty document")
+    return feed
+
+
+def parse_feed_feedparser(content: bytes, base_url: str, max_entries: int,
+                          headers: Optional[Dict[str, str]] = None) -> Dict:
+    """Lenient feedparser parse into the same shape as parse_feed_fast (whole document).
+
+    A plain module-level function so it can run in the parsing process pool.
+    """
+    response_headers = {"content-location": base_url}
+    response_headers.update(headers or {})
+    parsed = feedparser.parse(content, response_headers=response_headers)
+    item_timestamps = [
+        struct_to_timestamp(entry.get("published_parsed") or entry.get("updated_parsed"))
+        for entry in parsed.entries
+    ]
+    entries = []
+    for entry, published_ts in zip(parsed.entries[:max_entries], item_timestamps):
+        entries.append({
+            "title": entry.get("title", ""),
+            "link": entry.get("link", ""),
+            "id": entry.get("id", ""),
+            "published": entry.get("published", ""),
+            "published_ts": published_ts,
+            "summary": entry.get("summary", ""),
+        })
+    return {
+        "title": parsed.feed.get("title"),
+        "ttl": parsed.feed.get("ttl"),
+        "update_period": parsed.feed.get("sy_updateperiod"),
+        "update_frequency": parsed.feed.get("sy_updatefrequency"),
+        "entries": entries,
+        "item_timestamps": item_timestamps,
+    }
@@ -0,0 +1,199 @@
+"""Shared HTTP fetch layer with keep-alive connection pooling and hard deadlines."""
+
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    USER_AGENT, CONNECT_TIMEOUT, READ_TIMEOUT, TOTAL_FETCH_TIMEOUT,
+    POOL_CONNECTIONS, POOL_MAXSIZE, HOST_MAX_CONNECTIONS, HOST_CONNECTION_LIMITS
+)
+
+
+class FetchTimeout(requests.Timeout):
+    """Raised when a download exceeds its total wall-clock deadline."""
+
+
+@dataclass
+class FetchResult:
+    """Bytes and metadata of a completed HTTP download."""
+    url: str
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    content: bytes = b""
+    elapsed: float = 0.0
+    truncated: bool = False  # Body was cut short by max_bytes or an on_chunk stop
+
+    def raise_for_status(self):
+        """Raise an HTTPError for 4xx/5xx responses."""
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error for url: {self.url}")
+
+
+def host_limit(url: str) -> Tuple[str, int]:
+    """Concurrency key and cap for a URL's host; a configured domain covers its subdomains."""
+    host = (urlsplit(url).hostname or "").lower()
+    labels = host.split(".")
+    for index in range(len(labels) - 1):
+        domain = ".".join(labels[index:])
+        if domain in HOST_CONNECTION_LIMITS:
+            return domain, HOST_CONNECTION_LIMITS[domain]
+    return host, HOST_MAX_CONNECTIONS
+
+
+class HTTPFetcher:
+    """Downloads URLs over a pooled keep-alive session with connect, read and total deadlines."""
+
+    def __init__(self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT,
+                 total_timeout: float = TOTAL_FETCH_TIMEOUT):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+
+        # One adapter shared by http and https so connections are pooled per host
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Per-host request caps so workers queue for a busy host instead of opening extra connections
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+
+    def _host_slot(self, url: str) -> Tuple[str, threading.BoundedSemaphore]:
+        """The semaphore limiting concurrent requests to a URL's host."""
+        key, limit = host_limit(url)
+        with self._host_slots_lock:
+            slot = self._host_slots.get(key)
+            if slot is None:
+                slot = self._host_slots[key] = threading.BoundedSemaphore(limit)
+        return key, slot
+
+    def url_for(self, url: str) -> str:
+        """Address actually requested for a URL (replay fetchers point this at a local server)."""
+        return url
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+              total_timeout: Optional[float] = None, max_bytes: Optional[int] = None,
+              on_chunk: Optional[Callable[[bytes], bool]] = None) -> FetchResult:
+        """Download a URL and return its body, enforcing a total deadline on the transfer.
+        
+        max_bytes caps the body size; on_chunk receives each chunk and may return True
+        to stop the download early (e.g. once enough article text has been parsed).
+        """
+        total_timeout = total_timeout or self.total_timeout
+        start_time = time.monotonic()
+        deadline = start_time + total_timeout
+
+        # Waiting for a free slot counts against the same deadline
+        host, slot = self._host_slot(url)
+        if not slot.acquire(timeout=total_timeout):
+            raise FetchTimeout(f"No free connection to {host} within {total_timeout}s: {url}")
+        try:
+            return self._download(url, headers, start_time, deadline, total_timeout, max_bytes, on_chunk)
+        finally:
+            slot.release()
+
+    def _download(self, url: str, headers: Optional[Dict[str, str]], start_time: float, deadline: float,
+                  total_timeout: float, max_bytes: Optional[int],
+                  on_chunk: Optional[Callable[[bytes], bool]]) -> FetchResult:
+        """Stream one response body within the deadline (host slot held by the caller)."""
+        # requests' timeouts apply per socket read, so neither may exceed the time left,
+        # and a timer closes the response once the deadline passes so a trickling body
+        # cannot keep a read blocked beyond it
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise FetchTimeout(f"Download exceeded {total_timeout}s: {url}")
+        request_url = self.url_for(url)
+        try:
+            response = self.session.get(
+                request_url,
+                headers=headers,
+                timeout=(min(self.connect_timeout, remaining), min(self.read_timeout, remaining)),
+                stream=True
+            )
+        except requests.Timeout as e:
+            if time.monotonic() >= deadline:
+                raise FetchTimeout(f"Download exceeded {total_timeout}s: {url}") from e
+            raise
+        
+        expired = threading.Event()
+        
+        def expire():
+            expired.set()
+            _abort(response)
+        
+        timer = threading.Timer(max(0.0, deadline - time.monotonic()), expire)
+        timer.daemon = True
+        timer.start()
+        try:
+            chunks = []
+            received = 0
+            truncated = False
+            for chunk in response.iter_content(chunk_size=16384):
+                if chunk:
+                    if max_bytes is not None and received + len(chunk) > max_bytes:
+                        chunk = chunk[:max_bytes - received]
+                        truncated = True
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if on_chunk is not None and on_chunk(chunk):
+                        truncated = True
+                    if truncated:
+                        break
+                if time.monotonic() > deadline:
+                    raise FetchTimeout(f"Download exceeded {total_timeout}s: {url}")
+
+            return FetchResult(
+                url=response.url if request_url == url else url,
+                status_code=response.status_code,
+                headers={key.lower(): value for key, value in response.headers.items()},
+                content=b"".join(chunks),
+                elapsed=time.monotonic() - start_time,
+                truncated=truncated
+            )
+        except FetchTimeout:
+            raise
+        except Exception as e:
+            # Whatever the aborted read raised, the cause is the deadline
+            if expired.is_set() or time.monotonic() >= deadline:
+                raise FetchTimeout(f"Download exceeded {total_timeout}s: {url}") from e
+            raise
+        finally:
+            timer.cancel()
+            response.close()
+
+
+def _abort(response: requests.Response):
+    """Shut down a response's socket so a read blocked in another thread returns at once."""
+    try:
+        # urllib3 hands the socket over to the http.client response it reads from
+        fileno = response.raw._fp.fileno()
+        with socket.fromfd(fileno, socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.shutdown(socket.SHUT_RDWR)
+    except (AttributeError, ValueError, OSError):
+        pass
+    response.close()
+
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_default_fetcher() -> HTTPFetcher:
+    """Return the process-wide fetcher so keep-alive connections survive across agent runs."""
+    global _default_fetcher
+    if _default_fetcher is None:
+        with _default_fetcher_lock:
+            if _default_fetcher is None:
+                _default_fetcher = HTTPFetcher()
+    return _default_fetcher
@@ -0,0 +1,244 @@
+"""Record/replay HTTP fixtures for offline scraping benchmarks.
+
+RecordingFetcher captures live feed and article responses into a compressed zip
+archive; ReplayServer serves an archive from a local HTTP server with per-host
+latency and failure injection, and ReplayFetcher routes every request to it.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+import zipfile
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+from fetcher import FetchResult, HTTPFetcher
+
+MANIFEST_NAME = "manifest.json"
+# Response headers that describe the original transfer rather than the (decoded) body we store
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+CONDITIONAL_HEADERS = {"if-none-match", "if-modified-since"}
+REPLAY_CHUNK_SIZE = 16384
+FAILURE_MODES = ("error", "reset", "timeout")
+
+
+class FixtureArchive:
+    """URL -> (status, headers, body) responses, stored as a deflated zip (manifest + one member per body)."""
+
+    def __init__(self, recorded_at: Optional[float] = None):
+        self.recorded_at = recorded_at or time.time()
+        self.responses: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, url: str, status_code: int, headers: Dict[str, str], body: bytes):
+        """Record one response, keeping headers that still apply to the stored body."""
+        kept = {key: value for key, value in headers.items() if key.lower() not in DROPPED_HEADERS}
+        with self._lock:
+            self.responses[url] = {"status": status_code, "headers": kept, "body": body}
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Recorded response for a URL, or None."""
+        return self.responses.get(url)
+
+    def save(self, path: str):
+        """Write the archive; identical bodies are stored once."""
+        manifest = {"recorded_at": self.recorded_at, "responses": {}}
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+            written = set()
+            for url, response in sorted(self.responses.items()):
+                member = "bodies/" + hashlib.sha1(response["body"]).hexdigest()
+                if member not in written:
+                    archive.writestr(member, response["body"])
+                    written.add(member)
+                manifest["responses"][url] = {
+                    "status": response["status"], "headers": response["headers"], "body": member
+                }
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=1, sort_keys=True))
+
+    @classmethod
+    def load(cls, path: str) -> "FixtureArchive":
+        """Read an archive written by save()."""
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+            fixtures = cls(recorded_at=manifest["recorded_at"])
+            for url, response in manifest["responses"].items():
+                fixtures.responses[url] = {
+                    "status": response["status"],
+                    "headers": response["headers"],
+                    "body": archive.read(response["body"]),
+                }
+        return fixtures
+
+
+class RecordingFetcher(HTTPFetcher):
+    """HTTPFetcher that also stores every complete response in a FixtureArchive.
+
+    Only downloads made through fetch() are recorded, i.e. by the threaded NewsScraper:
+    AsyncNewsScraper downloads with aiohttp and only asks its fetcher for url_for().
+    """
+
+    def __init__(self, archive: FixtureArchive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+              total_timeout: Optional[float] = None, max_bytes: Optional[int] = None,
+              on_chunk: Optional[Callable[[bytes], bool]] = None) -> FetchResult:
+        """Fetch without validators or early stop so the fixture holds the full body, then
+        apply on_chunk to the recorded bytes exactly as a live download would."""
+        headers = {key: value for key, value in (headers or {}).items() if key.lower() not in CONDITIONAL_HEADERS}
+        result = super().fetch(url, headers=headers, total_timeout=total_timeout, max_bytes=max_bytes)
+        self.archive.add(url, result.status_code, result.headers, result.content)
+
+        if on_chunk is None:
+            return result
+        for offset in range(0, len(result.content), REPLAY_CHUNK_SIZE):
+            if on_chunk(result.content[offset:offset + REPLAY_CHUNK_SIZE]):
+                return replace(result, content=result.content[:offset + REPLAY_CHUNK_SIZE], truncated=True)
+        return result
+
+
+class ReplayServer:
+    """Local HTTP server answering /replay?url=<original URL> from a FixtureArchive.
+
+    latency and failure_rate are per original host (falling back to the defaults).
+    Failures are either a 503 ("error"), a dropped connection ("reset") or a response
+    that never arrives within any fetch deadline ("timeout"). A fixed seed makes the
+    injected failures reproducible.
+    """
+
+    def __init__(self, archive: FixtureArchive, latency: Optional[Dict[str, float]] = None,
+                 default_latency: float = 0.0, failure_rate: Optional[Dict[str, float]] = None,
+                 default_failure_rate: float = 0.0, failure_mode: str = "error",
+                 hang_seconds: float = 120.0, seed: int = 0):
+        if failure_mode not in FAILURE_MODES:
+            raise ValueError(f"Unknown failure mode: {failure_mode} (expected one of {', '.join(FAILURE_MODES)})")
+        self.archive = archive
+        self.latency = latency or {}
+        self.default_latency = default_latency
+        self.failure_rate = failure_rate or {}
+        self.default_failure_rate = default_failure_rate
+        self.failure_mode = failure_mode
+        self.hang_seconds = hang_seconds
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"served": 0, "not_modified": 0, "missing": 0, "failed": 0}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, url: str) -> str:
+        """Local replay URL for an original URL."""
+        return f"{self.base_url}/replay?url={quote(url, safe='')}"
+
+    def _should_fail(self, host: str) -> bool:
+        rate = self.failure_rate.get(host, self.default_failure_rate)
+        if rate <= 0:
+            return False
+        with self._random_lock:
+            return self._random.random() < rate
+
+    def _respond(self, url: str, request_headers) -> Tuple[str, Optional[Dict]]:
+        """Decide what to send for a request: (outcome, recorded response)."""
+        host = urlsplit(url).hostname or ""
+        delay = self.latency.get(host, self.default_latency)
+        if delay:
+            time.sleep(delay)
+
+        if self._should_fail(host):
+            return "failed", None
+
+        response = self.archive.get(url)
+        if response is None:
+            return "missing", None
+
+        headers = {key.lower(): value for key, value in response["headers"].items()}
+        etag = request_headers.get("If-None-Match")
+        last_modified = request_headers.get("If-Modified-Since")
+        if (etag and etag == headers.get("etag")) or (last_modified and last_modified == headers.get("last-modified")):
+            return "not_modified", response
+        return "served", response
+
+    def _make_handler(self):
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                query = parse_qs(urlsplit(self.path).query)
+                url = query.get("url", [""])[0]
+                outcome, response = server._respond(url, self.headers)
+                server.stats[outcome] += 1
+
+                if outcome == "failed":
+                    if server.failure_mode == "reset":
+                        self.close_connection = True
+                        return
+                    if server.failure_mode == "timeout":
+                        time.sleep(server.hang_seconds)
+                        self.close_connection = True
+                        return
+                    self._send(503, {}, b"injected failure")
+                elif outcome == "missing":
+                    self._send(404, {}, b"not recorded")
+                elif outcome == "not_modified":
+                    self._send(304, response["headers"], b"")
+                else:
+                    self._send(response["status"], response["headers"], response["body"])
+
+            def _send(self, status: int, headers: Dict[str, str], body: bytes):
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+        return ReplayHandler
+
+    def start(self) -> "ReplayServer":
+        """Serve on an ephemeral localhost port in a background thread."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class ReplayFetcher(HTTPFetcher):
+    """HTTPFetcher whose requests all go to a ReplayServer instead of the network."""
+
+    def __init__(self, server: ReplayServer, **kwargs):
+        # Every request goes to the one local server, so its pool must hold all workers;
+        # per-host caps still apply to the original hosts
+        kwargs.setdefault("pool_maxsize", 100)
+        super().__init__(**kwargs)
+        self.server = server
+
+    def url_for(self, url: str) -> str:
+        return self.server.url_for(url)
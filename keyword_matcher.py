@@ -0,0 +1,108 @@
+"""Aho-Corasick automaton: finds which of a fixed keyword set occur in a text in one pass."""
+
+from operator import itemgetter
+from typing import Dict, Iterable, List, Set, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordAutomaton:
+    """Reports every keyword that occurs as a substring of a text (same result as `keyword in text`).
+
+    Uses pyahocorasick (C) when installed. The pure-Python fallback resolves transitions
+    through failure links on first use and then memoizes them per state, so after
+    warm-up each character costs a single dict lookup.
+    """
+
+    def __init__(self, keywords: Iterable[str], use_native: bool = AHOCORASICK_AVAILABLE):
+        self.keywords: List[str] = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        self._native = None
+        if use_native and AHOCORASICK_AVAILABLE:
+            self._build_native()
+        else:
+            self._build()
+
+    def _build_native(self):
+        """pyahocorasick automaton with each keyword's id as its value."""
+        self._native = ahocorasick.Automaton()
+        for keyword_id, keyword in enumerate(self.keywords):
+            if keyword:
+                self._native.add_word(keyword, keyword_id)
+            else:
+                # The empty string occurs in every text
+                self._outputs[0] += (keyword_id,)
+        if len(self._native):
+            self._native.make_automaton()
+        else:
+            self._native = None
+            self._delta = [{}]
+
+    def _build(self):
+        """Trie of all keywords, then breadth-first failure links with merged outputs."""
+        node_outputs: List[List[int]] = [[]]
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    node_outputs.append([])
+                state = next_state
+            node_outputs[state].append(keyword_id)
+
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                queue.append(child)
+
+        # Each state reports its own keywords plus those of its failure chain (suffix matches)
+        self._outputs = [()] * len(self._goto)
+        self._outputs[0] = tuple(node_outputs[0])
+        for state in queue:
+            self._outputs[state] = tuple(node_outputs[state]) + self._outputs[self._fail[state]]
+        # Trie edges become the first entries of the memoized transition tables
+        self._delta: List[Dict[str, int]] = [dict(edges) for edges in self._goto]
+
+    def _transition(self, state: int, char: str) -> int:
+        """Resolve and memoize the next state for a character not yet seen in this state."""
+        fallback = state
+        while fallback and char not in self._goto[fallback]:
+            fallback = self._fail[fallback]
+        next_state = self._goto[fallback].get(char, 0)
+        self._delta[state][char] = next_state
+        return next_state
+
+    def find(self, text: str) -> Set[int]:
+        """Ids (positions in self.keywords) of all keywords occurring in text."""
+        if self._native is not None:
+            found = set(self._outputs[0])
+            found.update(map(itemgetter(1), self._native.iter(text)))
+            return found
+
+        delta = self._delta
+        outputs = self._outputs
+        found = set(outputs[0])
+        state = 0
+        for char in text:
+            try:
+                state = delta[state][char]
+            except KeyError:
+                state = self._transition(state, char)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
@@ -4,6 +4,7 @@
 import argparse
 import sys
 from agent import AINewsAgent
+from config import SCRAPER_ENGINE, RUN_DEADLINE, INCREMENTAL_SCRAPING
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
@@ -41,13 +42,36 @@ def main():
         action="store_true",
         help="Skip AI summarization (categorization only)"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Categorize and start summarizing each source's articles as soon as it finishes"
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=RUN_DEADLINE,
+        help="Seconds to wait for sources before continuing with partial results (default: wait for all)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "async"],
+        default=SCRAPER_ENGINE,
+        help=f"Scraping engine: thread pool or asyncio event loop (default: {SCRAPER_ENGINE})"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=INCREMENTAL_SCRAPING,
+        help="Only process feed items newer than each source's watermark from the last completed run"
+    )
     
     args = parser.parse_args()
     
     console = Console()
     
     try:
-        agent = AINewsAgent()
+        agent = AINewsAgent(engine=args.engine, incremental=args.incremental)
         
         # MVP/Fast mode: skip full content and summaries
         fetch_full_content = not args.fast
@@ -59,7 +83,9 @@ def main():
         results = agent.run(
             days=args.days,
             fetch_full_content=fetch_full_content,
-            generate_summaries=generate_summaries
+            generate_summaries=generate_summaries,
+            stream=args.stream,
+            deadline=args.deadline
         )
         
         # Display results
@@ -73,6 +99,8 @@ def main():
         # Summary statistics
         total_articles = sum(len(articles) for articles in results.values())
         console.print(f"\n[green]✓[/green] Processed {total_articles} articles across {len(results)} categories")
+        if agent.missing_sources:
+            console.print(f"[yellow]Missing sources (deadline reached): {', '.join(agent.missing_sources)}[/yellow]")
         
     except KeyboardInterrupt:
         console.print("\n[yellow]Interrupted by user[/yellow]")
@@ -0,0 +1,70 @@
+"""Process pool for CPU-bound, pure-Python parsing (feedparser, BeautifulSoup) off the GIL."""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from config import PARSE_PROCESSES
+
+
+def _mp_context():
+    """forkserver where available: forking a process that already runs I/O threads is unsafe."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class ParsePool:
+    """Runs module-level parse functions on raw bytes in worker processes and returns plain data.
+
+    With processes=0 (or after the pool breaks) the function runs in the calling thread.
+    """
+
+    def __init__(self, processes: int = PARSE_PROCESSES):
+        self.processes = processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Start the worker processes on first use."""
+        if self.processes <= 0:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=_mp_context())
+        return self._executor
+
+    def run(self, func: Callable, *args):
+        """Call func(*args) in a worker process and wait for its result."""
+        executor = self._get_executor()
+        if executor is None:
+            return func(*args)
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenProcessPool:
+            print("  ⚠ Parse worker pool died, parsing in-process from now on")
+            self.processes = 0
+            return func(*args)
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ParsePool:
+    """Return the process-wide parse pool so workers are started once and reused across runs."""
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = ParsePool()
+    return _default_pool
@@ -0,0 +1,87 @@
+"""Per-category ranking: picks the top-k articles by category confidence, recency and source quality."""
+
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import (
+    AGGREGATOR_SOURCES, RANK_WEIGHTS, RANK_RECENCY_HALF_LIFE, RANK_ORIGINAL_SOURCE_SCORE,
+    RANK_AGGREGATOR_SOURCE_SCORE, RANK_COVERAGE_BONUS,
+)
+
+
+def recency_score(article: Dict, now: float) -> float:
+    """1.0 for an article published now, halving every RANK_RECENCY_HALF_LIFE; 0.0 if undated."""
+    published_ts = article.get("published_ts")
+    if published_ts is not None:
+        age = max(0.0, now - published_ts)
+    elif article.get("days_ago") is not None:
+        age = max(0, article["days_ago"]) * 86400
+    else:
+        return 0.0
+    return 0.5 ** (age / RANK_RECENCY_HALF_LIFE)
+
+
+def source_score(article: Dict) -> float:
+    """Original publishers over aggregators, plus a bonus per other source carrying the story."""
+    if article.get("source_id") in AGGREGATOR_SOURCES:
+        score = RANK_AGGREGATOR_SOURCE_SCORE
+    else:
+        score = RANK_ORIGINAL_SOURCE_SCORE
+    coverage = len(article.get("duplicate_sources") or ())
+    return min(1.0, score + coverage * RANK_COVERAGE_BONUS)
+
+
+def rank_score(article: Dict, now: float) -> float:
+    """Weighted sum of category confidence, recency and source quality."""
+    return (
+        RANK_WEIGHTS["confidence"] * article.get("category_score", 0.0)
+        + RANK_WEIGHTS["recency"] * recency_score(article, now)
+        + RANK_WEIGHTS["source"] * source_score(article)
+    )
+
+
+def rank_key(article: Dict, now: float) -> Tuple:
+    """Sort key (higher is better); ties fall back to newer, then link and title, never arrival order."""
+    published_ts = article.get("published_ts")
+    return (
+        round(rank_score(article, now), 9),
+        published_ts if published_ts is not None else float("-inf"),
+        article.get("link") or "",
+        article.get("title") or "",
+    )
+
+
+def select_top(articles: List[Dict], k: int, now: Optional[float] = None) -> List[Dict]:
+    """The k best articles, best first, via a bounded heap (O(n log k), no full sort)."""
+    now = time.time() if now is None else now
+    return heapq.nlargest(k, articles, key=lambda article: rank_key(article, now))
+
+
+class TopK:
+    """Running top-k of articles arriving one at a time (min-heap of the k best so far)."""
+
+    def __init__(self, k: int, now: Optional[float] = None):
+        self.k = k
+        self.now = time.time() if now is None else now
+        self._heap: List[Tuple] = []
+        self._count = 0
+
+    def push(self, article: Dict) -> bool:
+        """Offer an article; True if it is currently among the top k."""
+        if self.k <= 0:
+            return False
+        # The counter only separates articles whose keys are identical, so dicts are never compared
+        entry = (rank_key(article, self.now), -self._count, article)
+        self._count += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def items(self) -> List[Dict]:
+        """Current top-k articles, best first."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
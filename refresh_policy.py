@@ -0,0 +1,73 @@
+"""Decide how often a feed can actually change, from <ttl>, sy:updatePeriod and observed item cadence."""
+
+from typing import Dict, List, Optional
+
+from config import MIN_REFRESH_INTERVAL, MAX_REFRESH_INTERVAL
+
+# RSS syndication module periods (http://purl.org/rss/1.0/modules/syndication/)
+UPDATE_PERIODS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 7 * 86400,
+    "monthly": 30 * 86400,
+    "yearly": 365 * 86400,
+}
+
+# Poll at this fraction of the typical gap between items so new ones are not missed for long
+OBSERVED_INTERVAL_FACTOR = 0.5
+# Fewer gaps than this say nothing about the cadence (one gap may be a burst or a lull)
+MIN_OBSERVED_GAPS = 3
+
+
+def build_refresh_hints(ttl: Optional[str], update_period: Optional[str],
+                        update_frequency: Optional[str], item_timestamps: List[float]) -> Dict:
+    """Collect the raw refresh signals of a parsed feed."""
+    return {
+        "ttl": ttl,
+        "update_period": update_period,
+        "update_frequency": update_frequency,
+        "item_timestamps": [ts for ts in item_timestamps if ts is not None],
+    }
+
+
+def _declared_interval(hints: Dict) -> Optional[float]:
+    """Interval the publisher declares via <ttl> (minutes) or sy:updatePeriod / sy:updateFrequency."""
+    intervals = []
+
+    try:
+        ttl_minutes = float(hints.get("ttl") or 0)
+        if ttl_minutes > 0:
+            intervals.append(ttl_minutes * 60)
+    except (TypeError, ValueError):
+        pass
+
+    period = UPDATE_PERIODS.get((hints.get("update_period") or "").strip().lower())
+    if period:
+        try:
+            frequency = max(1, int(hints.get("update_frequency") or 1))
+        except (TypeError, ValueError):
+            frequency = 1
+        intervals.append(period / frequency)
+
+    return min(intervals) if intervals else None
+
+
+def _observed_interval(hints: Dict) -> Optional[float]:
+    """Median gap between consecutive items; identical timestamps (batch publishes) are ignored."""
+    timestamps = sorted(set(hints.get("item_timestamps") or []), reverse=True)
+    gaps = sorted(newer - older for newer, older in zip(timestamps, timestamps[1:]))
+    if len(gaps) < MIN_OBSERVED_GAPS:
+        return None
+    return gaps[len(gaps) // 2] * OBSERVED_INTERVAL_FACTOR
+
+
+def refresh_interval(hints: Optional[Dict]) -> float:
+    """Seconds until the feed is worth polling again; 0 means poll every run (no usable signal)."""
+    if not hints:
+        return 0.0
+
+    candidates = [interval for interval in (_declared_interval(hints), _observed_interval(hints)) if interval]
+    if not candidates:
+        return 0.0
+    # The shortest signal wins so a lagging declaration never hides new items
+    return min(MAX_REFRESH_INTERVAL, max(MIN_REFRESH_INTERVAL, min(candidates)))
@@ -1,110 +1,296 @@
 """Web scraper for fetching AI news articles."""
 
-import requests
-import feedparser
+import math
 from bs4 import BeautifulSoup
-from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Tuple
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from config import NEWS_SOURCES, REQUEST_TIMEOUT, USER_AGENT, MAX_ARTICLES_PER_SOURCE, RATE_LIMIT_DELAY
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from config import (
+    NEWS_SOURCES, MAX_ARTICLES_PER_SOURCE, RATE_LIMIT_DELAY,
+    CONTENT_FETCH_WORKERS, MAX_CONTENT_CHARS, CONTENT_MAX_BYTES, REFRESH_CADENCE_ITEMS
+)
+from fetcher import HTTPFetcher, get_default_fetcher
+from feed_cache import FeedCache
+from content_cache import ContentCache
+from source_health import SourceHealth
+from source_scheduler import SourceScheduler
+from content_extractor import LXML_AVAILABLE, StreamingTextExtractor
+from date_utils import parse_timestamp
+from refresh_policy import build_refresh_hints, refresh_interval
+from watermarks import WatermarkStore
+from feed_parser import UnsupportedFeed, parse_feed_fast, parse_feed_feedparser
+from parse_pool import ParsePool, get_parse_pool
+
+
+def run_deadline(deadline: Optional[float]) -> Optional[float]:
+    """A scrape deadline in seconds, or None to wait for every source (0, negative or non-finite)."""
+    if deadline is None or not math.isfinite(deadline) or deadline <= 0:
+        return None
+    return float(deadline)
+
+
+def extract_text_html_parser(html: bytes) -> Optional[str]:
+    """Extract the main readable text from an article page with BeautifulSoup (html.parser).
+    
+    Module-level so it can run in the parsing process pool.
+    """
+    try:
+        soup = BeautifulSoup(html, "html.parser")
+        
+        # Remove script and style elements
+        for script in soup(["script", "style", "nav", "header", "footer"]):
+            script.decompose()
+        
+        # Try to find main content
+        content_selectors = [
+            "article",
+            ".article-content",
+            ".post-content",
+            ".entry-content",
+            "main",
+            ".content"
+        ]
+        
+        content = None
+        for selector in content_selectors:
+            element = soup.select_one(selector)
+            if element:
+                content = element.get_text(separator=" ", strip=True)
+                break
+        
+        # Fallback to body if no specific content found
+        if not content:
+            body = soup.find("body")
+            if body:
+                content = body.get_text(separator=" ", strip=True)
+        
+        # Clean up content
+        if content:
+            content = " ".join(content.split())
+            # Limit content length
+            if len(content) > MAX_CONTENT_CHARS:
+                content = content[:MAX_CONTENT_CHARS] + "..."
+        
+        return content
+    except Exception as e:
+        print(f"Error extracting article content: {e}")
+        return None
 
 
 class NewsScraper:
     """Scrapes news articles from various sources."""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": USER_AGENT})
+    def __init__(self, fetcher: Optional[HTTPFetcher] = None, use_feed_cache: bool = True,
+                 use_content_cache: bool = True, track_health: bool = True, prioritize_sources: bool = True,
+                 respect_refresh_hints: bool = True, incremental: bool = False, fast_feed_parser: bool = True,
+                 parse_pool: Optional[ParsePool] = None):
+        # Shared pooled fetcher keeps TLS connections alive across runs
+        self.fetcher = fetcher or get_default_fetcher()
+        self.session = self.fetcher.session
+        self.feed_cache = FeedCache() if use_feed_cache else None
+        # Skip polling feeds whose ttl / sy:updatePeriod / item cadence says they cannot have changed
+        self.respect_refresh_hints = respect_refresh_hints
+        # Streaming lxml parser for plain RSS 2.0 / Atom; feedparser handles everything else
+        self.fast_feed_parser = fast_feed_parser
+        # Shared worker processes for pure-Python parsing, so it scales past the GIL
+        self.parse_pool = parse_pool or get_parse_pool()
+        self.content_cache = ContentCache() if use_content_cache else None
+        self.health = SourceHealth() if track_health else None
+        # Scheduling needs the yield and latency history kept by the health tracker
+        self.scheduler = SourceScheduler(self.health) if (prioritize_sources and self.health) else None
+        # Incremental mode only passes on items newer than the last completed run's watermark
+        self.watermarks = WatermarkStore() if incremental else None
+        self._pending_watermarks = {}
+        self.last_missing_sources = []
+        self.last_completed_sources = set()
     
     def fetch_rss_feed(self, url: str, max_items: int = MAX_ARTICLES_PER_SOURCE) -> List[Dict]:
-        """Fetch and parse RSS feed."""
-        articles = []
+        """Fetch and parse RSS feed, revalidating any cached copy with a conditional GET."""
         try:
-            feed = feedparser.parse(url)
-            # Filter for AI-related content if feed is general
-            # Reduced from max_items * 2 to max_items + 2 for faster processing
-            for entry in feed.entries[:max_items + 2]:
-                title = entry.get("title", "").lower()
-                summary = entry.get("summary", "").lower()
-                
-                # Basic AI keyword filter for general feeds
-                ai_keywords = ["ai", "artificial intelligence", "machine learning", "ml", "llm", 
-                              "neural", "deep learning", "gpt", "claude", "gemini", "openai",
-                              "anthropic", "transformer", "model", "algorithm"]
-                
-                # For general feeds, check if content is AI-related
-                is_ai_related = any(keyword in title or keyword in summary for keyword in ai_keywords)
-                
-                # Always include if from AI-specific sources or if AI-related
-                if is_ai_related or len(articles) < max_items:
-                    article = {
-                        "title": entry.get("title", ""),
-                        "link": entry.get("link", ""),
-                        "published": entry.get("published", ""),
-                        "summary": entry.get("summary", ""),
-                        "source": feed.feed.get("title", "Unknown"),
-                    }
-                    articles.append(article)
-                    if len(articles) >= max_items:
-                        break
+            return self._download_feed(url, max_items)
         except Exception as e:
             print(f"  ⚠️  Error fetching RSS feed {url}: {str(e)[:100]}")
+            return []
+    
+    def _download_feed(self, url: str, max_items: int, total_timeout: Optional[float] = None) -> List[Dict]:
+        """Conditional GET and parse of a feed; network and HTTP errors propagate to the caller."""
+        cached = self._get_cached_feed(url, max_items)
+        headers = self.feed_cache.conditional_headers(cached) if cached else None
+        result = self.fetcher.fetch(url, headers=headers, total_timeout=total_timeout)
+        return self._handle_feed_result(url, result, max_items, cached)
+    
+    def _get_cached_feed(self, url: str, max_items: int) -> Optional[Dict]:
+        """Return the cached feed entry if it holds enough articles to satisfy max_items."""
+        if not self.feed_cache:
+            return None
+        cached = self.feed_cache.get(url)
+        if cached and cached["max_items"] >= max_items:
+            return cached
+        return None
+    
+    def _articles_if_not_due(self, url: str, max_items: int) -> Optional[List[Dict]]:
+        """Cached articles for a feed that cannot have changed yet, or None if it should be polled."""
+        if not self.respect_refresh_hints:
+            return None
+        cached = self._get_cached_feed(url, max_items)
+        if cached and cached["next_due_at"] > time.time():
+            return [dict(article) for article in cached["articles"][:max_items]]
+        return None
+    
+    def _handle_feed_result(self, url: str, result, max_items: int, cached: Optional[Dict]) -> List[Dict]:
+        """Turn a feed download into articles, serving the cached copy on 304 Not Modified."""
+        if result.status_code == 304 and cached:
+            self.feed_cache.touch(url)
+            return [dict(article) for article in cached["articles"][:max_items]]
+        
+        result.raise_for_status()
+        articles, refresh_hints = self._parse_feed(result.content, url, max_items, result.headers)
+        
+        # Don't cache empty parses - a 304 would then pin a broken result
+        if self.feed_cache and articles:
+            self.feed_cache.store(
+                url,
+                result.headers.get("etag"),
+                result.headers.get("last-modified"),
+                articles,
+                max_items,
+                refresh_interval(refresh_hints)
+            )
         return articles
     
-    def fetch_article_content(self, url: str) -> Optional[str]:
-        """Fetch full article content from URL."""
+    def parse_rss_feed(self, content: bytes, url: str, max_items: int = MAX_ARTICLES_PER_SOURCE,
+                       headers: Optional[Dict[str, str]] = None) -> List[Dict]:
+        """Parse downloaded RSS/Atom bytes into article dicts."""
+        articles, _ = self._parse_feed(content, url, max_items, headers)
+        return articles
+    
+    def _parse_feed(self, content: bytes, url: str, max_items: int,
+                    headers: Optional[Dict[str, str]] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Parse feed bytes into (articles, refresh hints used to schedule the next poll)."""
+        articles = []
+        refresh_hints = None
         try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, "html.parser")
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "header", "footer"]):
-                script.decompose()
+            feed = self._read_feed_entries(content, url, max_items, headers)
+            for entry in feed["entries"][:max_items]:
+                articles.append({
+                    "title": entry["title"],
+                    "link": entry["link"],
+                    "guid": entry["id"] or entry["link"],
+                    "published": entry["published"],
+                    # Epoch seconds parsed once here so later stages never re-parse
+                    "published_ts": entry["published_ts"],
+                    "summary": entry["summary"],
+                    "source": feed["title"] or "Unknown",
+                })
             
-            # Try to find main content
-            content_selectors = [
-                "article",
-                ".article-content",
-                ".post-content",
-                ".entry-content",
-                "main",
-                ".content"
-            ]
-            
-            content = None
-            for selector in content_selectors:
-                element = soup.select_one(selector)
-                if element:
-                    content = element.get_text(separator=" ", strip=True)
-                    break
+            refresh_hints = build_refresh_hints(
+                feed["ttl"], feed["update_period"], feed["update_frequency"], feed["item_timestamps"]
+            )
+        except Exception as e:
+            print(f"  ⚠️  Error parsing RSS feed {url}: {str(e)[:100]}")
+        return articles, refresh_hints
+    
+    def _read_feed_entries(self, content: bytes, url: str, max_entries: int,
+                           headers: Optional[Dict[str, str]] = None) -> Dict:
+        """Channel metadata and the first max_entries entries, normalized to plain dicts.
+        
+        Plain RSS 2.0 and Atom go through the streaming lxml parser, which stops after
+        max_entries items (reading just the dates of up to REFRESH_CADENCE_ITEMS for
+        the refresh policy); anything else (RSS 1.0/RDF, malformed XML) falls back to feedparser.
+        """
+        if self.fast_feed_parser:
+            try:
+                return parse_feed_fast(content, url, max_entries, REFRESH_CADENCE_ITEMS)
+            except UnsupportedFeed:
+                pass
+        
+        # feedparser is pure Python; run it in the process pool so it does not hold the GIL
+        return self.parse_pool.run(parse_feed_feedparser, content, url, max_entries, headers)
+    
+    def fetch_article_content(self, url: str) -> Optional[str]:
+        """Fetch full article content from URL.
+        
+        The page is streamed with a CONTENT_MAX_BYTES ceiling and parsed incrementally
+        with lxml, so the download stops as soon as enough body text has arrived.
+        """
+        if self.content_cache:
+            cached = self.content_cache.get(url)
+            if cached:
+                return cached
+        
+        try:
+            extractor = StreamingTextExtractor() if LXML_AVAILABLE else None
+            result = self.fetcher.fetch(
+                url,
+                max_bytes=CONTENT_MAX_BYTES,
+                on_chunk=extractor.feed if extractor else None
+            )
+            result.raise_for_status()
             
-            # Fallback to body if no specific content found
+            content = extractor.extract() if extractor else None
             if not content:
-                body = soup.find("body")
-                if body:
-                    content = body.get_text(separator=" ", strip=True)
-            
-            # Clean up content
-            if content:
-                content = " ".join(content.split())
-                # Limit content length
-                if len(content) > 5000:
-                    content = content[:5000] + "..."
+                # html.parser fallback for pages lxml could not make sense of
+                content = self.extract_article_text(result.content)
             
+            if content and self.content_cache:
+                self.content_cache.put(url, content)
             return content
         except Exception as e:
             print(f"Error fetching article content from {url}: {e}")
             return None
     
-    def _scrape_single_source(self, source_name: str, source_config: Dict, fetch_full_content: bool = False) -> tuple:
-        """Scrape a single news source (helper method for parallel execution)."""
+    def extract_article_text(self, html: bytes) -> Optional[str]:
+        """Extract the main readable text from an article page."""
+        # html.parser is pure Python; run it in the process pool so it does not hold the GIL
+        return self.parse_pool.run(extract_text_html_parser, html)
+    
+    def fetch_contents(self, articles: List[Dict], max_workers: int = CONTENT_FETCH_WORKERS) -> int:
+        """Fetch full content for selected articles in place with bounded concurrency."""
+        pending = [article for article in articles if article.get("link") and not article.get("full_content")]
+        if not pending:
+            return 0
+        
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+            future_to_article = {
+                executor.submit(self.fetch_article_content, article["link"]): article
+                for article in pending
+            }
+            for future in as_completed(future_to_article):
+                article = future_to_article[future]
+                full_content = future.result()
+                if full_content:
+                    article["full_content"] = full_content
+                    fetched += 1
+        
+        return fetched
+    
+    def _scrape_single_source(self, source_name: str, source_config: Dict,
+                              fetch_full_content: bool = False) -> Tuple[str, Optional[List[Dict]]]:
+        """Scrape a single news source (helper method for parallel execution).
+        
+        Returns None instead of articles when the source failed or was skipped. Run
+        bookkeeping (watermarks, completed sources) is left to the consumer, so a source
+        finishing after the deadline leaves no trace in the run.
+        """
+        if self.health and self.health.is_circuit_open(source_name):
+            print(f"⏸ {source_name}: circuit open after repeated failures, skipping")
+            return source_name, None
+        
         articles = []
+        start_time = time.monotonic()
         try:
             if source_config["type"] == "rss":
-                articles = self.fetch_rss_feed(source_config["url"])
+                not_due = self._articles_if_not_due(source_config["url"], MAX_ARTICLES_PER_SOURCE)
+                if not_due is not None:
+                    print(f"💤 {source_name}: not due for refresh yet, serving {len(not_due)} cached articles")
+                    return source_name, self._tag_source(source_name, not_due)
+                
+                timeout = self.health.timeout_for(source_name) if self.health else None
+                articles = self._download_feed(source_config["url"], MAX_ARTICLES_PER_SOURCE, total_timeout=timeout)
+                if self.health:
+                    self.health.record(source_name, time.monotonic() - start_time, True, len(articles))
+                articles = self._tag_source(source_name, articles)
                 
                 # Optionally enhance articles with full content (slower)
                 if fetch_full_content:
@@ -115,38 +301,149 @@ class NewsScraper:
                                 article["full_content"] = full_content
         except Exception as e:
             print(f"✗ {source_name}: Error - {str(e)[:100]}")
-            return source_name, []
+            if self.health:
+                self.health.record(source_name, time.monotonic() - start_time, False)
+            return source_name, None
         
         return source_name, articles
     
-    def scrape_all_sources(self, fetch_full_content: bool = False, max_workers: int = 20) -> List[Dict]:
-        """Scrape all configured news sources in parallel for 5-10x speed improvement."""
-        all_articles = []
-        total_sources = len(NEWS_SOURCES)
+    def _tag_source(self, source_name: str, articles: List[Dict]) -> List[Dict]:
+        """Tag articles with their source key, keeping only items past the watermark in incremental mode."""
+        articles = self._apply_watermark(source_name, articles)
+        for article in articles:
+            article["source_id"] = source_name
+        return articles
+    
+    def _apply_watermark(self, source_name: str, articles: List[Dict]) -> List[Dict]:
+        """In incremental mode, keep only items newer than the source's watermark."""
+        if not self.watermarks:
+            return articles
         
-        print(f"\n🚀 Scraping {total_sources} sources in parallel (max {max_workers} workers)...\n")
-        start_time = time.time()
+        watermark = self.watermarks.get(source_name)
+        fresh = WatermarkStore.new_articles(articles, watermark)
+        if watermark:
+            print(f"  ↻ {source_name}: {len(fresh)} new of {len(articles)} items since last run")
+        return fresh
+    
+    def _mark_completed(self, source_name: str, articles: List[Dict]):
+        """Count a source whose articles were handed to the consumer towards this run's yield and
+        hold back its new watermark until the run completes.
+        
+        A source with nothing new since its watermark is left out of the yield feedback:
+        an unchanged feed says nothing about how useful its items are.
+        """
+        watermark = self.watermarks.get(source_name) if self.watermarks else None
+        if articles or watermark is None:
+            self.last_completed_sources.add(source_name)
+        newest = WatermarkStore.newest(articles) if self.watermarks else None
+        if newest:
+            if newest["published_ts"] is None and watermark:
+                newest["published_ts"] = watermark["published_ts"]
+            # Held back until the run completes, so a crashed run reprocesses its items
+            self._pending_watermarks[source_name] = newest
+    
+    def commit_watermarks(self):
+        """Advance the watermarks of every source processed in the finished run."""
+        if not self.watermarks:
+            return
+        for source_name, watermark in self._pending_watermarks.items():
+            self.watermarks.set(source_name, watermark)
+        self._pending_watermarks = {}
+    
+    def _plan_sources(self) -> List[Tuple[str, Dict]]:
+        """Sources to fetch this run, highest expected useful yield per second first."""
+        if not self.scheduler:
+            return list(NEWS_SOURCES.items())
+        
+        planned, deferred = self.scheduler.plan(NEWS_SOURCES)
+        if deferred:
+            print(f"⏭ Deferring {len(deferred)} sources with no useful articles in recent runs: {', '.join(deferred)}")
+        return planned
+    
+    def record_yield(self, categorized: Dict[str, List[Dict]]):
+        """Feed back how many articles per source survived filtering and categorization."""
+        if not self.health:
+            return
+        
+        useful = {}
+        for articles in categorized.values():
+            for article in articles:
+                source_id = article.get("source_id")
+                if source_id:
+                    useful[source_id] = useful.get(source_id, 0) + 1
+        
+        for source_name in self.last_completed_sources:
+            self.health.record_yield(source_name, useful.get(source_name, 0))
+    
+    def get_source_stats(self) -> List[Dict]:
+        """Per-source latency percentiles, error rate, yield and circuit state (slowest first)."""
+        return self.health.stats() if self.health else []
+    
+    def iter_scrape_sources(self, fetch_full_content: bool = False, max_workers: int = 20,
+                            deadline: Optional[float] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """Scrape all sources in parallel, yielding (source_name, articles) as each source completes.
+        
+        With a deadline (seconds from the call), sources still running when it expires are
+        abandoned and listed in self.last_missing_sources. A deadline of 0 or less means none.
+        """
+        deadline = run_deadline(deadline)
+        self.last_missing_sources = []
+        self.last_completed_sources = set()
+        self._pending_watermarks = {}
+        sources = self._plan_sources()
+        total_sources = len(sources)
         
         # Use ThreadPoolExecutor to scrape multiple sources simultaneously
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all scraping jobs
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            # Submit all scraping jobs in priority order - the pool starts them first-in first-out
             future_to_source = {
                 executor.submit(self._scrape_single_source, name, config, fetch_full_content): name
-                for name, config in NEWS_SOURCES.items()
+                for name, config in sources
             }
+            pending = set(future_to_source)
             
             completed = 0
-            # Process results as they complete
-            for future in as_completed(future_to_source):
-                source_name = future_to_source[future]
-                completed += 1
-                
-                try:
-                    source_name, articles = future.result(timeout=REQUEST_TIMEOUT + 5)
-                    all_articles.extend(articles)
+            try:
+                # Process results as they complete
+                for future in as_completed(future_to_source, timeout=deadline):
+                    pending.discard(future)
+                    source_name = future_to_source[future]
+                    completed += 1
+                    
+                    try:
+                        source_name, articles = future.result()
+                    except Exception as e:
+                        print(f"[{completed}/{total_sources}] ✗ {source_name}: {str(e)[:100]}")
+                        continue
+                    
+                    if articles is None:
+                        articles = []
+                    else:
+                        self._mark_completed(source_name, articles)
                     print(f"[{completed}/{total_sources}] ✓ {source_name}: {len(articles)} articles")
-                except Exception as e:
-                    print(f"[{completed}/{total_sources}] ✗ {source_name}: {str(e)[:100]}")
+                    yield source_name, articles
+            except FuturesTimeoutError:
+                self.last_missing_sources = sorted(future_to_source[future] for future in pending)
+                print(f"⏰ Deadline of {deadline}s reached - continuing without {len(pending)} sources: "
+                      f"{', '.join(self.last_missing_sources)}")
+        finally:
+            # Consumer may stop early or the deadline may expire - drop queued sources
+            # and don't wait for stragglers (their own fetch timeouts end them)
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def scrape_all_sources(self, fetch_full_content: bool = False, max_workers: int = 20,
+                           deadline: Optional[float] = None) -> List[Dict]:
+        """Scrape all configured news sources in parallel for 5-10x speed improvement."""
+        all_articles = []
+        total_sources = len(NEWS_SOURCES)
+        
+        print(f"\n🚀 Scraping {total_sources} sources in parallel (max {max_workers} workers)...\n")
+        start_time = time.time()
+        
+        for _, articles in self.iter_scrape_sources(fetch_full_content=fetch_full_content,
+                                                    max_workers=max_workers, deadline=deadline):
+            all_articles.extend(articles)
         
         elapsed_time = time.time() - start_time
         print(f"\n✅ Scraping complete! {len(all_articles)} total articles in {elapsed_time:.1f}s\n")
@@ -155,24 +452,28 @@ class NewsScraper:
     
     def filter_recent_articles(self, articles: List[Dict], days: int = 7) -> List[Dict]:
         """Filter articles to only include recent ones."""
-        from dateparser import parse as parse_date
-        
         recent_articles = []
-        cutoff_date = datetime.now()
+        now = time.time()
         
         for article in articles:
+            published_ts = article.get("published_ts")
             published_str = article.get("published", "")
-            if published_str:
+            if published_ts is None and published_str:
                 try:
-                    published_date = parse_date(published_str)
-                    if published_date:
-                        days_ago = (cutoff_date - published_date.replace(tzinfo=None)).days
-                        if days_ago <= days:
-                            article["days_ago"] = days_ago
-                            recent_articles.append(article)
+                    published_ts = parse_timestamp(published_str)
                 except Exception:
                     # If date parsing fails, include the article anyway
                     recent_articles.append(article)
+                    continue
+                if published_ts is None:
+                    continue
+                article["published_ts"] = published_ts
+            
+            if published_ts is not None:
+                days_ago = int((now - published_ts) // 86400)
+                if days_ago <= days:
+                    article["days_ago"] = days_ago
+                    recent_articles.append(article)
             else:
                 # If no date, include it
                 recent_articles.append(article)
@@ -0,0 +1,179 @@
+"""Persistent seen-article set: a Bloom filter in front of an exact SQLite index keyed by canonical URL hash."""
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from category_cache import keywords_version
+from config import CATEGORY_KEYWORDS, SEEN_STORE_FILE, SEEN_BLOOM_CAPACITY, SEEN_BLOOM_ERROR_RATE, SEEN_RETENTION
+from storage import open_database, ensure_columns
+from url_utils import url_hash
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over hex digests (no false negatives, ~error_rate false positives)."""
+
+    def __init__(self, capacity: int = SEEN_BLOOM_CAPACITY, error_rate: float = SEEN_BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: str) -> Iterable[int]:
+        """Bit positions by double hashing two 64-bit slices of the digest."""
+        first = int(digest[:16], 16)
+        second = int(digest[16:32], 16) | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, digest: str):
+        """Insert a digest."""
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: str) -> bool:
+        """False means definitely never added; True means probably added."""
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class SeenArticleStore:
+    """Remembers each processed article's category and AI summary so later runs can reuse them.
+
+    The Bloom filter answers "never seen" without touching the database, which is
+    the common case for fresh items; only probable hits go to the exact index.
+    It is rebuilt from the index on startup, so entries written by other processes
+    after that are only found on their next start (a miss just means reprocessing).
+    Stored categories carry the keyword version they were computed under; after
+    CATEGORY_KEYWORDS changes, those articles count as novel again.
+    """
+
+    def __init__(self, path: str = SEEN_STORE_FILE, retention: float = SEEN_RETENTION,
+                 keywords: Dict[str, List[str]] = CATEGORY_KEYWORDS):
+        self.path = path
+        self.retention = retention
+        self.keywords_version = keywords_version(keywords)
+        self._lock = threading.Lock()
+        self._conn = open_database(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen (
+                url_hash TEXT PRIMARY KEY,
+                category TEXT,
+                ai_summary TEXT,
+                first_seen_at REAL NOT NULL,
+                last_seen_at REAL NOT NULL
+            )
+        """)
+        # category_tier: 1 when categorized on title and summary, 2 when on the full content
+        ensure_columns(self._conn, "seen", {
+            "keywords_version": "TEXT", "category_score": "REAL", "category_tier": "INTEGER",
+        })
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_last_seen ON seen (last_seen_at)")
+        self.bloom = BloomFilter()
+        self._load()
+
+    def _load(self):
+        """Drop entries past the retention period and fill the Bloom filter from the rest."""
+        with self._lock:
+            self._conn.execute("DELETE FROM seen WHERE last_seen_at < ?", (time.time() - self.retention,))
+            for row in self._conn.execute("SELECT url_hash FROM seen"):
+                self.bloom.add(row["url_hash"])
+
+    @staticmethod
+    def _key(article: Dict) -> Optional[str]:
+        """Canonical URL hash of an article, or None without a link."""
+        link = article.get("link")
+        return url_hash(link) if link else None
+
+    def apply_known(self, articles: List[Dict]) -> List[Dict]:
+        """Copy stored results onto articles seen before and return the novel ones.
+
+        Known articles get "category" (when they had one) with its "category_score" and
+        "category_tier", any stored "ai_summary", and are flagged with "seen_before".
+        Articles categorized under other keyword lists count as novel.
+        """
+        novel = []
+        candidates = {}
+        for article in articles:
+            key = self._key(article)
+            if key and key in self.bloom:
+                candidates.setdefault(key, []).append(article)
+            else:
+                novel.append(article)
+
+        rows = {}
+        if candidates:
+            keys = list(candidates)
+            now = time.time()
+            with self._lock:
+                # Chunked to stay under SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    for row in self._conn.execute(
+                            f"SELECT * FROM seen WHERE url_hash IN ({placeholders})", chunk):
+                        rows[row["url_hash"]] = row
+                    self._conn.execute(
+                        f"UPDATE seen SET last_seen_at = ? WHERE url_hash IN ({placeholders})", [now] + chunk
+                    )
+
+        for key, matches in candidates.items():
+            row = rows.get(key)
+            for article in matches:
+                # Bloom filter false positive, or a category from other keyword lists
+                if row is None or row["keywords_version"] != self.keywords_version:
+                    novel.append(article)
+                    continue
+                article["seen_before"] = True
+                if row["category"]:
+                    article["category"] = row["category"]
+                    article["category_score"] = row["category_score"]
+                article["category_tier"] = row["category_tier"]
+                if row["ai_summary"] and not article.get("ai_summary"):
+                    article["ai_summary"] = row["ai_summary"]
+        return novel
+
+    def record_categories(self, articles: List[Dict]):
+        """Remember the category (or lack of one), its score and tier of freshly categorized articles."""
+        now = time.time()
+        rows = []
+        for article in articles:
+            key = self._key(article)
+            if key:
+                rows.append((key, article.get("category"), article.get("category_score", 0.0),
+                             article.get("category_tier", 1), self.keywords_version, now, now))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO seen (url_hash, category, category_score, category_tier, keywords_version, "
+                "first_seen_at, last_seen_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url_hash) DO UPDATE SET category = excluded.category, "
+                # A summary written for another category is not reused
+                "ai_summary = CASE WHEN seen.category IS excluded.category THEN seen.ai_summary END, "
+                "category_score = excluded.category_score, category_tier = excluded.category_tier, "
+                "keywords_version = excluded.keywords_version, last_seen_at = excluded.last_seen_at",
+                rows
+            )
+            for key, *_ in rows:
+                self.bloom.add(key)
+
+    def record_summaries(self, articles: List[Dict]):
+        """Store generated AI summaries so later runs do not pay for them again."""
+        rows = []
+        for article in articles:
+            key = self._key(article)
+            if key and article.get("ai_summary"):
+                rows.append((article["ai_summary"], key))
+        with self._lock:
+            self._conn.executemany("UPDATE seen SET ai_summary = ? WHERE url_hash = ?", rows)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_seen_store() -> SeenArticleStore:
+    """Return the process-wide store so its Bloom filter is built once, not on every agent run."""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = SeenArticleStore()
+    return _default_store
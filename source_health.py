@@ -0,0 +1,154 @@
+"""Per-source health tracking: rolling latency/error/yield stats, circuit breakers and adaptive timeouts."""
+
+import json
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import (
+    SOURCE_HEALTH_FILE, HEALTH_WINDOW, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN,
+    MIN_SOURCE_TIMEOUT, TOTAL_FETCH_TIMEOUT, TIMEOUT_P95_MULTIPLIER
+)
+from storage import open_database, ensure_columns
+
+# Samples needed before a source gets its own timeout instead of the global one
+MIN_TIMEOUT_SAMPLES = 5
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class SourceHealth:
+    """Keeps the last HEALTH_WINDOW fetch outcomes per source and decides when to skip or time out."""
+
+    def __init__(self, path: str = SOURCE_HEALTH_FILE, window: int = HEALTH_WINDOW):
+        self.path = path
+        self.window = window
+        self._lock = threading.Lock()
+        self._conn = open_database(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                name TEXT PRIMARY KEY,
+                samples TEXT NOT NULL,
+                consecutive_failures INTEGER NOT NULL DEFAULT 0,
+                circuit_open_until REAL NOT NULL DEFAULT 0
+            )
+        """)
+        ensure_columns(self._conn, "sources", {
+            "yields": "TEXT NOT NULL DEFAULT '[]'",
+            "last_fetched_at": "REAL NOT NULL DEFAULT 0",
+        })
+
+    @staticmethod
+    def _row_to_state(row) -> Dict:
+        """Decode a sources row."""
+        return {
+            "samples": json.loads(row["samples"]),
+            "consecutive_failures": row["consecutive_failures"],
+            "circuit_open_until": row["circuit_open_until"],
+            "yields": json.loads(row["yields"]),
+            "last_fetched_at": row["last_fetched_at"],
+        }
+
+    def _load(self, name: str) -> Dict:
+        """Read a source's row (lock held)."""
+        row = self._conn.execute("SELECT * FROM sources WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return {"samples": [], "consecutive_failures": 0, "circuit_open_until": 0.0,
+                    "yields": [], "last_fetched_at": 0.0}
+        return self._row_to_state(row)
+
+    def _save(self, name: str, state: Dict):
+        """Write a source's row (lock held)."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sources "
+            "(name, samples, consecutive_failures, circuit_open_until, yields, last_fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (name, json.dumps(state["samples"]), state["consecutive_failures"],
+             state["circuit_open_until"], json.dumps(state["yields"]), state["last_fetched_at"])
+        )
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """All sources' raw state in one query."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM sources").fetchall()
+        return {row["name"]: self._row_to_state(row) for row in rows}
+
+    def record(self, name: str, latency: float, ok: bool, articles: int = 0):
+        """Record the outcome of one fetch and open the circuit after repeated failures."""
+        now = time.time()
+        with self._lock:
+            state = self._load(name)
+            samples = state["samples"]
+            samples.append({"at": now, "latency": round(latency, 3), "ok": ok, "articles": articles})
+            samples = samples[-self.window:]
+
+            if ok:
+                failures = 0
+                open_until = 0.0
+            else:
+                failures = state["consecutive_failures"] + 1
+                open_until = state["circuit_open_until"]
+                # A failed half-open probe reopens the circuit for another cooldown
+                if failures >= CIRCUIT_FAILURE_THRESHOLD:
+                    open_until = now + CIRCUIT_COOLDOWN
+
+            state.update(samples=samples, consecutive_failures=failures,
+                         circuit_open_until=open_until, last_fetched_at=now)
+            self._save(name, state)
+
+    def record_yield(self, name: str, useful_articles: int):
+        """Record how many of a source's articles survived date filtering and categorization."""
+        with self._lock:
+            state = self._load(name)
+            state["yields"] = (state["yields"] + [useful_articles])[-self.window:]
+            self._save(name, state)
+
+    def is_circuit_open(self, name: str) -> bool:
+        """Whether a source is in cooldown; after the cooldown one probe fetch is allowed."""
+        with self._lock:
+            state = self._load(name)
+        return state["circuit_open_until"] > time.time()
+
+    def timeout_for(self, name: str) -> float:
+        """Total download timeout derived from the source's observed p95 latency."""
+        with self._lock:
+            state = self._load(name)
+        latencies = [sample["latency"] for sample in state["samples"] if sample["ok"]]
+        if len(latencies) < MIN_TIMEOUT_SAMPLES:
+            return TOTAL_FETCH_TIMEOUT
+        p95 = percentile(latencies, 95)
+        return min(TOTAL_FETCH_TIMEOUT, max(MIN_SOURCE_TIMEOUT, p95 * TIMEOUT_P95_MULTIPLIER))
+
+    def stats(self) -> List[Dict]:
+        """Summary per source, slowest p95 first."""
+        states = self.snapshot()
+
+        now = time.time()
+        summary = []
+        for name, state in states.items():
+            samples = state["samples"]
+            latencies = [sample["latency"] for sample in samples]
+            successes = [sample for sample in samples if sample["ok"]]
+            summary.append({
+                "source": name,
+                "samples": len(samples),
+                "latency_p50": percentile(latencies, 50),
+                "latency_p95": percentile(latencies, 95),
+                "error_rate": round(1 - len(successes) / len(samples), 3) if samples else None,
+                "avg_articles": round(sum(s["articles"] for s in successes) / len(successes), 2) if successes else 0.0,
+                "avg_useful_articles": round(sum(state["yields"]) / len(state["yields"]), 2) if state["yields"] else None,
+                "consecutive_failures": state["consecutive_failures"],
+                "circuit_open": state["circuit_open_until"] > now,
+                "circuit_open_until": state["circuit_open_until"] or None,
+            })
+
+        summary.sort(key=lambda item: item["latency_p95"] or 0, reverse=True)
+        return summary
@@ -0,0 +1,63 @@
+"""Priority scheduling of news sources by measured useful yield and latency."""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import EMPTY_SOURCE_RUNS, EMPTY_SOURCE_INTERVAL
+from source_health import SourceHealth, percentile
+
+# Optimistic prior for sources without history so new feeds get measured early
+NEW_SOURCE_YIELD = 1.0
+DEFAULT_LATENCY = 1.0
+# Keeps a zero-yield but fast source ahead of a zero-yield slow one
+YIELD_SMOOTHING = 0.1
+MIN_LATENCY = 0.2
+
+
+class SourceScheduler:
+    """Orders sources so high-yield, fast feeds are fetched first and chronically empty ones less often."""
+
+    def __init__(self, health: SourceHealth):
+        self.health = health
+
+    @staticmethod
+    def priority(state: Optional[Dict]) -> float:
+        """Expected useful articles per second of fetching, discounted by error rate."""
+        if not state:
+            return (NEW_SOURCE_YIELD + YIELD_SMOOTHING) / DEFAULT_LATENCY
+
+        yields = state["yields"]
+        expected_yield = sum(yields) / len(yields) if yields else NEW_SOURCE_YIELD
+
+        samples = state["samples"]
+        latencies = [sample["latency"] for sample in samples if sample["ok"]]
+        latency = percentile(latencies, 50) if latencies else DEFAULT_LATENCY
+        success_rate = sum(1 for sample in samples if sample["ok"]) / len(samples) if samples else 1.0
+
+        return (expected_yield + YIELD_SMOOTHING) * success_rate / max(latency, MIN_LATENCY)
+
+    @staticmethod
+    def is_chronically_empty(state: Optional[Dict]) -> bool:
+        """No useful articles in each of the last EMPTY_SOURCE_RUNS runs."""
+        if not state:
+            return False
+        recent = state["yields"][-EMPTY_SOURCE_RUNS:]
+        return len(recent) >= EMPTY_SOURCE_RUNS and not any(recent)
+
+    def plan(self, sources: Dict[str, Dict]) -> Tuple[List[Tuple[str, Dict]], List[str]]:
+        """Return (sources to fetch in priority order, names deferred this run)."""
+        states = self.health.snapshot()
+        now = time.time()
+
+        scheduled = []
+        deferred = []
+        for name, config in sources.items():
+            state = states.get(name)
+            if self.is_chronically_empty(state) and now - state["last_fetched_at"] < EMPTY_SOURCE_INTERVAL:
+                deferred.append(name)
+                continue
+            scheduled.append((self.priority(state), name, config))
+
+        # sort is stable, so equal priorities keep NEWS_SOURCES order
+        scheduled.sort(key=lambda item: item[0], reverse=True)
+        return [(name, config) for _, name, config in scheduled], deferred
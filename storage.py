@@ -0,0 +1,25 @@
+"""SQLite helpers for the on-disk caches shared across agent runs and gunicorn workers."""
+
+import os
+import sqlite3
+from typing import Dict
+
+
+def open_database(path: str) -> sqlite3.Connection:
+    """Open (and create if needed) a SQLite database tuned for concurrent readers."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Autocommit mode; callers serialize access to the connection with their own lock
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    # WAL lets several gunicorn workers read while one writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def ensure_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]):
+    """Add columns introduced after a table was first created."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, declaration in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
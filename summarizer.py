@@ -83,18 +83,20 @@ Summary:"""
         if not articles:
             return []
         
-        summarized_articles = []
+        # Articles summarized earlier (e.g. by the streaming pipeline) are kept as-is
+        summarized_articles = [article for article in articles if article.get("ai_summary")]
+        pending_articles = [article for article in articles if not article.get("ai_summary")]
         
         # Use ThreadPoolExecutor for parallel API calls
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all summary generation jobs
             future_to_article = {
                 executor.submit(self.generate_summary, article, category): article
-                for article in articles
+                for article in pending_articles
             }
             
             completed = 0
-            total = len(articles)
+            total = len(pending_articles)
             
             # Process results as they complete
             for future in as_completed(future_to_article):
@@ -0,0 +1,94 @@
+"""URL canonicalization so the same article gets the same key across feeds, AMP variants and runs."""
+
+import hashlib
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref_src", "cmpid", "ncid", "guccounter", "guce_referrer", "guce_referrer_sig",
+}
+TRACKING_PREFIXES = ("utm_",)
+# Query parameters that only select the AMP rendition of a page
+AMP_PARAMS = {"amp", "amp_js_v", "usqp"}
+# Hosts serving cached AMP copies as /<prefix>/s/<original host>/<path>
+AMP_CACHE_HOSTS = ("www.google.com", "google.com")
+AMP_CACHE_SUFFIX = ".cdn.ampproject.org"
+
+
+def _unwrap_amp_cache(netloc: str, path: str) -> Optional[str]:
+    """Original URL behind a Google / ampproject.org AMP cache URL, or None."""
+    segments = path.lstrip("/").split("/")
+    if netloc in AMP_CACHE_HOSTS and len(segments) >= 3 and segments[:2] == ["amp", "s"]:
+        return "https://" + "/".join(segments[2:])
+    if netloc.endswith(AMP_CACHE_SUFFIX) and len(segments) >= 3 and segments[0] in ("c", "v", "i") \
+            and segments[1] == "s":
+        return "https://" + "/".join(segments[2:])
+    return None
+
+
+def _is_article_slug(segment: str) -> bool:
+    """Whether a path segment looks like an article slug or id rather than a section name."""
+    return any(char.isdigit() or char in "-_" for char in segment)
+
+
+def _strip_amp_path(netloc: str, path: str) -> Tuple[str, str]:
+    """Drop amp. subdomains, /amp/ prefixes, /amp suffixes after an article slug and .amp extensions."""
+    host = netloc.split(":", 1)[0]
+    # amp.dev or amp.com are sites of their own, not AMP variants of dev/com
+    if host.startswith("amp.") and "." in host[len("amp."):]:
+        netloc = netloc[len("amp."):]
+    if path.startswith("/amp/") and len(path) > len("/amp/"):
+        path = path[len("/amp"):]
+    segments = path.rstrip("/").split("/")
+    if len(segments) >= 3 and segments[-1] == "amp" and _is_article_slug(segments[-2]):
+        path = "/".join(segments[:-1])
+    if path.endswith(".amp"):
+        path = path[:-len(".amp")]
+    elif path.endswith(".amp.html"):
+        path = path[:-len(".amp.html")] + ".html"
+    return netloc, path
+
+
+def _is_dropped_param(key: str, value: str) -> bool:
+    """Tracking and AMP-selector query parameters."""
+    key = key.lower()
+    if key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES) or key in AMP_PARAMS:
+        return True
+    return key == "outputtype" and value.lower() == "amp"
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL: lowercase scheme/host, drop fragments, tracking params, AMP variants and trailing slashes."""
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+        original = _unwrap_amp_cache(parts.netloc.lower(), parts.path)
+        if original:
+            parts = urlsplit(original)
+    except ValueError:
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+
+    netloc, path = _strip_amp_path(netloc, parts.path or "/")
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_dropped_param(key, value)
+    ]
+    query.sort()
+
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def url_hash(url: str) -> str:
+    """Stable hex digest of a URL's canonical form."""
+    return hashlib.sha1(canonicalize_url(url).encode("utf-8")).hexdigest()
@@ -0,0 +1,80 @@
+"""Per-source watermarks (newest GUID/link and timestamp processed) for incremental runs."""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import WATERMARK_FILE
+from storage import open_database
+
+
+def article_guid(article: Dict) -> str:
+    """Stable identity of a feed item: its GUID, falling back to the link."""
+    return article.get("guid") or article.get("link") or ""
+
+
+class WatermarkStore:
+    """Remembers, per source, the newest item a completed run has already processed."""
+
+    def __init__(self, path: str = WATERMARK_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = open_database(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS watermarks (
+                source TEXT PRIMARY KEY,
+                guid TEXT NOT NULL,
+                link TEXT NOT NULL,
+                published_ts REAL,
+                updated_at REAL NOT NULL
+            )
+        """)
+
+    def get(self, source: str) -> Optional[Dict]:
+        """Return a source's watermark, or None if it has never been processed."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM watermarks WHERE source = ?", (source,)).fetchone()
+        if row is None:
+            return None
+        return {"guid": row["guid"], "link": row["link"], "published_ts": row["published_ts"]}
+
+    def set(self, source: str, watermark: Dict):
+        """Advance a source's watermark."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watermarks (source, guid, link, published_ts, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (source, watermark["guid"], watermark["link"], watermark["published_ts"], time.time())
+            )
+
+    @staticmethod
+    def new_articles(articles: List[Dict], watermark: Optional[Dict]) -> List[Dict]:
+        """Articles published after the watermark, in feed order.
+
+        Feeds list newest items first, so processing stops at the watermark item itself.
+        Items older than the watermark timestamp are dropped too, which covers feeds
+        where the watermark item has already rolled off.
+        """
+        if not watermark:
+            return list(articles)
+
+        fresh = []
+        for article in articles:
+            if article_guid(article) == watermark["guid"] or (
+                    watermark["link"] and article.get("link") == watermark["link"]):
+                break
+            published_ts = article.get("published_ts")
+            if (published_ts is not None and watermark["published_ts"] is not None
+                    and published_ts < watermark["published_ts"]):
+                continue
+            fresh.append(article)
+        return fresh
+
+    @staticmethod
+    def newest(articles: List[Dict]) -> Optional[Dict]:
+        """Watermark for a batch: the item with the latest timestamp, else the first listed."""
+        if not articles:
+            return None
+        dated = [article for article in articles if article.get("published_ts") is not None]
+        top = max(dated, key=lambda article: article["published_ts"]) if dated else articles[0]
+        return {"guid": article_guid(top), "link": top.get("link", ""), "published_ts": top.get("published_ts")}